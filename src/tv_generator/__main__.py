@@ -3,15 +3,8 @@
 Entry point for tv-generator package
 """
 
-import asyncio
-import sys
-from pathlib import Path
-
-# Добавляем текущую директорию в путь
-sys.path.insert(0, str(Path(__file__).parent))
-
-# Импортируем функцию main из main.py
-from .main import main
+# Импортируем точку входа CLI из main.py
+from .main import cli_entry
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    cli_entry()
@@ -3,20 +3,50 @@ API клиент для работы с TradingView Scanner API.
 """
 
 import asyncio
-import json as _json
 import os
+import random
 import ssl
 import time
+from collections import deque
 from dataclasses import dataclass
+from functools import lru_cache
 from http.cookiejar import MozillaCookieJar
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 from urllib.parse import urlparse
 
 import certifi
 import httpx
 from loguru import logger
 
+try:
+    import h2
+except ImportError:  # h2 is optional, without it httpx speaks HTTP/1.1 only
+    h2 = None
+
 from .config import settings
+from .json_io import dumps, loads
+
+if TYPE_CHECKING:
+    from .core.base import BaseCache
+
+# Неизменяемые части тела запроса /scan, общие для всех вызовов
+SCAN_OPTIONS = {"lang": "en"}
+SCAN_SYMBOLS = {"query": {"types": []}}
+SCAN_SORT = {"sortBy": "name", "sortOrder": "asc"}
+TICKER_COLUMNS = ["name", "close", "change", "change_abs", "volume"]
+
+# Правила проверки endpoint, собранные один раз
+ENDPOINT_DANGEROUS_CHARS = (";", "&", "|", "`", "$", "(", ")", "{", "}", "[", "]", '"', "'", "<", ">", "\\", "/", "..")
+ENDPOINT_SQL_PATTERNS = ("SELECT", "INSERT", "UPDATE", "DELETE", "DROP", "CREATE", "ALTER", "UNION")
+
+# Повторы: доля случайного разброса задержки и ее верхняя граница в секундах
+RETRY_JITTER = 0.3
+RETRY_MAX_DELAY = 30.0
+
+# metainfo меняется редко, поэтому в кэше живет сутки независимо от TTL кэша по умолчанию
+METAINFO_CACHE_TTL = 86400
+# Сколько хранится копия metainfo с ETag/Last-Modified для условного GET после истечения свежей
+METAINFO_REVALIDATE_TTL = 30 * 86400
 
 
 @dataclass
@@ -36,37 +66,40 @@ class RateLimiter:
         self.requests_per_second = requests_per_second
         self.burst_limit = burst_limit
         self.window_size = window_size
-        self.request_times: list[float] = []
+        self.request_times: deque[float] = deque()
         self.min_interval = 1.0 / requests_per_second
+        # Сериализует ожидание, чтобы параллельные запросы не обходили лимит
+        self._lock = asyncio.Lock()
 
     def _cleanup_old_requests(self, current_time: float) -> None:
         """Очистка старых запросов из окна."""
         cutoff = current_time - self.window_size
         while self.request_times and self.request_times[0] < cutoff:
-            self.request_times.pop(0)
+            self.request_times.popleft()
 
     async def wait(self) -> None:
         """Ожидание для соблюдения rate limit с учетом burst."""
-        current_time = time.time()
-        self._cleanup_old_requests(current_time)
+        async with self._lock:
+            current_time = time.time()
+            self._cleanup_old_requests(current_time)
 
-        # Проверка burst limit
-        if len(self.request_times) >= self.burst_limit:
-            wait_time = self.request_times[0] + self.window_size - current_time
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-                current_time = time.time()
-                self._cleanup_old_requests(current_time)
+            # Проверка burst limit
+            if len(self.request_times) >= self.burst_limit:
+                wait_time = self.request_times[0] + self.window_size - current_time
+                if wait_time > 0:
+                    await asyncio.sleep(wait_time)
+                    current_time = time.time()
+                    self._cleanup_old_requests(current_time)
 
-        # Проверка rate limit
-        if self.request_times:
-            time_since_last = current_time - self.request_times[-1]
-            if time_since_last < self.min_interval:
-                wait_time = self.min_interval - time_since_last
-                await asyncio.sleep(wait_time)
-                current_time = time.time()
+            # Проверка rate limit
+            if self.request_times:
+                time_since_last = current_time - self.request_times[-1]
+                if time_since_last < self.min_interval:
+                    wait_time = self.min_interval - time_since_last
+                    await asyncio.sleep(wait_time)
+                    current_time = time.time()
 
-        self.request_times.append(current_time)
+            self.request_times.append(current_time)
 
 
 class TradingViewAPIError(Exception):
@@ -99,6 +132,15 @@ class ValidationError(TradingViewAPIError):
     pass
 
 
+@lru_cache(maxsize=1)
+def _get_ssl_context() -> ssl.SSLContext:
+    """SSL контекст с проверкой сертификатов; CA-бандл загружается один раз на процесс."""
+    ssl_context = ssl.create_default_context(cafile=certifi.where())
+    ssl_context.verify_mode = ssl.CERT_REQUIRED
+    ssl_context.check_hostname = True
+    return ssl_context
+
+
 def validate_url(url: str) -> bool:
     """Проверка безопасности URL."""
     try:
@@ -140,8 +182,8 @@ def load_cookies(path: str) -> dict[str, str] | None:
 
     # Попытка загрузить как JSON
     try:
-        with open(path, encoding="utf-8") as f:
-            data = _json.load(f)
+        with open(path, "rb") as f:
+            data = loads(f.read())
         if isinstance(data, dict):
             return data
         if isinstance(data, list):
@@ -167,7 +209,7 @@ def load_cookies(path: str) -> dict[str, str] | None:
 class TradingViewAPI:
     """Клиент для работы с TradingView Scanner API."""
 
-    def __init__(self):
+    def __init__(self, cache: "BaseCache | None" = None):
         if not validate_url(settings.tradingview_base_url):
             raise SecurityError("Invalid base URL")
 
@@ -175,14 +217,21 @@ class TradingViewAPI:
         self.timeout = settings.request_timeout
         self.max_retries = settings.max_retries
         self.retry_delay = settings.retry_delay
+        # Необязательный кэш metainfo (например DiskCache): metainfo меняется редко
+        self.cache = cache
         self.rate_limiter = RateLimiter(
             settings.requests_per_second, burst_limit=settings.burst_limit, window_size=settings.window_size
         )
+        # endpoint -> label_product, первое совпадение как при линейном поиске по settings.markets
+        self._label_products: dict[str, str] = {}
+        for market_config in settings.markets.values():
+            self._label_products.setdefault(market_config["endpoint"], market_config["label_product"])
+        # (endpoint, метод) -> готовый URL и уже проверенные URL: проверки выполняются один раз
+        self._urls: dict[tuple[str, str], str] = {}
+        self._valid_urls: set[str] = set()
 
-        # SSL контекст с проверкой сертификатов
-        ssl_context = ssl.create_default_context(cafile=certifi.where())
-        ssl_context.verify_mode = ssl.CERT_REQUIRED
-        ssl_context.check_hostname = True
+        # SSL контекст с проверкой сертификатов, общий для всех клиентов
+        ssl_context = _get_ssl_context()
 
         # Загрузка cookies
         cookies = None
@@ -197,8 +246,14 @@ class TradingViewAPI:
                 logger.error(f"Security error loading cookies: {e}")
                 raise
 
+        # HTTP/2 мультиплексирует параллельные запросы в одном соединении
+        http2 = settings.http2 and h2 is not None
+        if settings.http2 and not http2:
+            logger.warning("HTTP/2 requested but h2 is not installed, falling back to HTTP/1.1")
+
         # HTTP клиент с улучшенной безопасностью
         self.client = httpx.AsyncClient(
+            http2=http2,
             timeout=self.timeout,
             headers={
                 "User-Agent": f"TradingView-OpenAPI-Generator/{settings.version}",
@@ -212,13 +267,24 @@ class TradingViewAPI:
             cookies=cookies,
             verify=ssl_context,
             follow_redirects=False,  # Запрещаем автоматические редиректы
+            # Один пул keep-alive соединений на весь клиент; все соединения пачки
+            # остаются открытыми, поэтому следующая пачка не повторяет TLS-рукопожатия
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16, keepalive_expiry=60.0),
         )
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Закрытие HTTP клиента и его пула соединений."""
         await self.client.aclose()
+        # Чистим просроченные записи кэша, если он это поддерживает (DiskCache)
+        purge_expired = getattr(self.cache, "purge_expired", None)
+        if purge_expired is not None:
+            await purge_expired()
 
     def _validate_endpoint(self, endpoint: str) -> None:
         """Проверка безопасности endpoint."""
@@ -226,8 +292,7 @@ class TradingViewAPI:
             raise SecurityError("Endpoint must be a string")
 
         # Проверка на опасные символы
-        dangerous_chars = [";", "&", "|", "`", "$", "(", ")", "{", "}", "[", "]", '"', "'", "<", ">", "\\", "/", ".."]
-        for char in dangerous_chars:
+        for char in ENDPOINT_DANGEROUS_CHARS:
             if char in endpoint:
                 raise SecurityError(f"Endpoint contains dangerous character: {char}")
 
@@ -236,53 +301,112 @@ class TradingViewAPI:
             raise SecurityError("Endpoint contains path traversal attempt")
 
         # Проверка на SQL инъекции
-        sql_patterns = ["SELECT", "INSERT", "UPDATE", "DELETE", "DROP", "CREATE", "ALTER", "UNION"]
-        for pattern in sql_patterns:
-            if pattern.upper() in endpoint.upper():
+        endpoint_upper = endpoint.upper()
+        for pattern in ENDPOINT_SQL_PATTERNS:
+            if pattern in endpoint_upper:
                 raise SecurityError(f"Endpoint contains SQL injection attempt: {pattern}")
 
         # Проверка на допустимые символы (только буквы, цифры, дефисы, подчеркивания)
         if not all(c.isalnum() or c in "-_" for c in endpoint):
             raise SecurityError("Endpoint contains invalid characters")
 
-    def _validate_request_data(self, data: dict | None) -> None:
-        """Проверка безопасности данных запроса."""
-        if data is not None:
-            if not isinstance(data, dict):
-                raise SecurityError("Request data must be a dictionary")
-            # Проверка на максимальный размер
-            if len(_json.dumps(data)) > 1024 * 1024:  # 1MB
-                raise SecurityError("Request data too large")
+    def _endpoint_url(self, endpoint: str, action: str) -> str:
+        """URL метода API для endpoint; endpoint проверяется при первом обращении."""
+        try:
+            return self._urls[(endpoint, action)]
+        except (KeyError, TypeError):
+            self._validate_endpoint(endpoint)
+            url = self._urls[(endpoint, action)] = f"{self.base_url}/{endpoint}/{action}"
+            return url
+
+    def _validate_request_data(self, data: dict | None) -> bytes | None:
+        """Проверка безопасности данных запроса; возвращает тело, сериализованное один раз."""
+        if data is None:
+            return None
+        if not isinstance(data, dict):
+            raise SecurityError("Request data must be a dictionary")
+        body = dumps(data)
+        # Проверка на максимальный размер
+        if len(body) > 1024 * 1024:  # 1MB
+            raise SecurityError("Request data too large")
+        return body
+
+    @staticmethod
+    async def _read_limited(response: httpx.Response, max_size: int) -> bytes:
+        """Читает тело потокового ответа, прерываясь, как только оно превышает max_size."""
+        declared = response.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > max_size:
+            raise SecurityError("Response too large")
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+            if size > max_size:
+                raise SecurityError("Response too large")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def _retry_delay(self, attempt: int, retry_after: str | None = None) -> float:
+        """Задержка перед повтором: Retry-After сервера, иначе линейный backoff со случайным разбросом."""
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), RETRY_MAX_DELAY)
+            except ValueError:
+                pass  # HTTP-date не поддерживаем, используем backoff
+        delay = self.retry_delay * (attempt + 1) * (1 + random.uniform(0, RETRY_JITTER))
+        return min(delay, RETRY_MAX_DELAY)
 
     async def _make_request(self, method: str, url: str, data: dict | None = None, **kwargs) -> APIResponse:
         """Выполнение HTTP запроса с обработкой ошибок и rate limiting."""
-        if not validate_url(url):
-            raise SecurityError(f"Invalid URL: {url}")
+        if url not in self._valid_urls:
+            if not validate_url(url):
+                raise SecurityError(f"Invalid URL: {url}")
+            self._valid_urls.add(url)
 
-        self._validate_request_data(data)
+        body = self._validate_request_data(data)
 
         for attempt in range(self.max_retries + 1):
             try:
                 await self.rate_limiter.wait()
 
-                response = await self.client.request(method, url, json=data, **kwargs)
-
-                # Проверка Content-Type
-                content_type = response.headers.get("content-type", "")
-                if not any(ct in content_type.lower() for ct in settings.allowed_content_types):
-                    raise SecurityError(f"Invalid content type: {content_type}")
-
-                # Проверка размера ответа
-                if len(response.content) > settings.max_request_size:
-                    raise SecurityError("Response too large")
-
-                if response.status_code == 429:
-                    raise RateLimitError("Rate limit exceeded")
+                # Тело читается потоком: чужой Content-Type и слишком большой ответ
+                # отбрасываются до того, как весь ответ окажется в памяти
+                # Готовые байты тела переиспользуются во всех повторах; Content-Type задан в заголовках клиента
+                request = self.client.build_request(method, url, content=body, **kwargs)
+                response = await self.client.send(request, stream=True)
+                if response.status_code == 304:
+                    # Условный запрос: тела нет, вызывающий берет сохраненную копию
+                    await response.aclose()
+                    return APIResponse(
+                        data=None, status_code=304, headers=dict(response.headers), url=str(response.url)
+                    )
+                if response.status_code == 429 or response.status_code >= 500:
+                    # Повтор решается по статусу до проверок тела: страницы лимитов
+                    # от прокси и CDN обычно приходят в HTML
+                    await response.aclose()
+                    if attempt < self.max_retries:
+                        retry_after = response.headers.get("retry-after") if response.status_code == 429 else None
+                        await asyncio.sleep(self._retry_delay(attempt, retry_after))
+                        continue
+                    if response.status_code == 429:
+                        raise RateLimitError("Rate limit exceeded")
+                    raise NetworkError(f"Server error: {response.status_code}")
+                try:
+                    # Проверка Content-Type
+                    content_type = response.headers.get("content-type", "")
+                    if not any(ct in content_type.lower() for ct in settings.allowed_content_types):
+                        raise SecurityError(f"Invalid content type: {content_type}")
+
+                    # Проверка размера ответа
+                    content = await self._read_limited(response, settings.max_request_size)
+                finally:
+                    await response.aclose()
 
                 response.raise_for_status()
 
+                # Разбираем байты тела напрямую, без промежуточной str
                 return APIResponse(
-                    data=response.json(),
+                    data=loads(content),
                     status_code=response.status_code,
                     headers=dict(response.headers),
                     url=str(response.url),
@@ -291,20 +415,18 @@ class TradingViewAPI:
             except httpx.TimeoutException:
                 if attempt == self.max_retries:
                     raise NetworkError("Request timed out after all retries")
-                await asyncio.sleep(self.retry_delay * (attempt + 1))
+                await asyncio.sleep(self._retry_delay(attempt))
 
             except httpx.NetworkError as e:
                 if attempt == self.max_retries:
                     raise NetworkError(f"Network error: {str(e)}")
-                await asyncio.sleep(self.retry_delay * (attempt + 1))
+                await asyncio.sleep(self._retry_delay(attempt))
 
             except httpx.HTTPStatusError as e:
-                if e.response.status_code >= 500:
-                    if attempt == self.max_retries:
-                        raise NetworkError(f"Server error: {e.response.status_code}")
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
-                else:
-                    raise TradingViewAPIError(f"HTTP {e.response.status_code}: {str(e)}")
+                raise TradingViewAPIError(f"HTTP {e.response.status_code}: {str(e)}")
+
+            except (RateLimitError, NetworkError):
+                raise
 
             except Exception as e:
                 raise TradingViewAPIError(f"Unexpected error: {str(e)}")
@@ -313,17 +435,53 @@ class TradingViewAPI:
 
     async def get_metainfo(self, endpoint: str) -> dict[str, Any]:
         """Получение metainfo для указанного эндпоинта."""
-        self._validate_endpoint(endpoint)
-        url = f"{self.base_url}/{endpoint}/metainfo"
-        response = await self._make_request("GET", url)
+        url = self._endpoint_url(endpoint, "metainfo")
+        cache_key = f"metainfo_{endpoint}"
+        if self.cache is None:
+            return self._metainfo_body(await self._make_request("GET", url))
+
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Свежая копия истекла: переспрашиваем с ETag/Last-Modified, 304 приходит без тела.
+        # Условные заголовки уходят, только если сохраненное тело есть
+        validated = await self.cache.get(f"{cache_key}_validated")
+        headers = {}
+        if validated is not None and validated.get("data") is not None:
+            if validated["etag"]:
+                headers["If-None-Match"] = validated["etag"]
+            if validated["last_modified"]:
+                headers["If-Modified-Since"] = validated["last_modified"]
+
+        response = await self._make_request("GET", url, headers=headers)
+        if response.status_code == 304 and headers:
+            data = validated["data"]
+        else:
+            data = self._metainfo_body(response)
+            etag = response.headers.get("etag")
+            last_modified = response.headers.get("last-modified")
+            if etag or last_modified:
+                await self.cache.set(
+                    f"{cache_key}_validated",
+                    {"etag": etag, "last_modified": last_modified, "data": data},
+                    ttl=METAINFO_REVALIDATE_TTL,
+                )
+        await self.cache.set(cache_key, data, ttl=METAINFO_CACHE_TTL)
+        return data
+
+    @staticmethod
+    def _metainfo_body(response: APIResponse) -> dict[str, Any]:
+        """Тело ответа metainfo; 304 без условного запроса или пустое тело - ошибка, а не None."""
+        if response.data is None:
+            raise TradingViewAPIError(f"No metainfo body in HTTP {response.status_code} response from {response.url}")
         return response.data
 
     async def scan_tickers(
         self, endpoint: str, label_product: str, limit: int = 100, filters: list[dict[str, Any]] | None = None
     ) -> list[dict[str, Any]]:
         """Сканирование тикеров для указанного рынка."""
-        self._validate_endpoint(endpoint)
-        url = f"{self.base_url}/{endpoint}/scan"
+        url = self._endpoint_url(endpoint, "scan")
 
         # Базовые фильтры - убираем проблемный market_cap_basic
         base_filters = []
@@ -333,12 +491,12 @@ class TradingViewAPI:
 
         data = {
             "filter": base_filters,
-            "options": {"lang": "en"},
+            "options": SCAN_OPTIONS,
             "range": [0, limit],
             "markets": [label_product],
-            "symbols": {"query": {"types": []}},
-            "columns": ["name", "close", "change", "change_abs", "volume"],
-            "sort": {"sortBy": "name", "sortOrder": "asc"},
+            "symbols": SCAN_SYMBOLS,
+            "columns": TICKER_COLUMNS,
+            "sort": SCAN_SORT,
         }
 
         response = await self._make_request("POST", url, data=data)
@@ -348,26 +506,20 @@ class TradingViewAPI:
         self, endpoint: str, symbol: str, fields: list[str], label_product: str | None = None
     ) -> dict[str, Any]:
         """Получение данных по полям для указанного символа."""
-        url = f"{self.base_url}/{endpoint}/scan"
+        url = self._endpoint_url(endpoint, "scan")
 
         # Определяем label_product если не передан
         if not label_product:
-            for market_config in settings.markets.values():
-                if market_config["endpoint"] == endpoint:
-                    label_product = market_config["label_product"]
-                    break
-
-        if not label_product:
-            label_product = "america"  # Fallback
+            label_product = self._label_products.get(endpoint) or "america"  # Fallback
 
         data = {
             "filter": [{"left": "name", "operation": "equal", "right": symbol}],
-            "options": {"lang": "en"},
+            "options": SCAN_OPTIONS,
             "range": [0, 1],
             "markets": [label_product],
-            "symbols": {"query": {"types": []}},
+            "symbols": SCAN_SYMBOLS,
             "columns": fields,
-            "sort": {"sortBy": "name", "sortOrder": "asc"},
+            "sort": SCAN_SORT,
         }
 
         response = await self._make_request("POST", url, data=data)
@@ -381,7 +533,7 @@ class TradingViewAPI:
             value = data.get(field)
             return value is not None and value != ""
         except Exception as e:
-            logger.debug(f"Field {field} test failed: {e}")
+            logger.debug("Field {} test failed: {}", field, e)
             return False
 
     async def get_market_info(self, endpoint: str) -> dict[str, Any]:
@@ -398,6 +550,10 @@ class TradingViewAPI:
             logger.error(f"Failed to get market info for {endpoint}: {e}")
             return {"endpoint": endpoint, "metainfo": {}, "fields_count": 0, "available": False, "error": str(e)}
 
+    async def get_markets_info(self, endpoints: list[str]) -> list[dict[str, Any]]:
+        """Информация о нескольких рынках: запросы идут параллельно через общий пул соединений."""
+        return list(await asyncio.gather(*(self.get_market_info(endpoint) for endpoint in endpoints)))
+
     async def health_check(self) -> dict[str, Any]:
         """Проверка здоровья API."""
         health_status = {"status": "healthy", "timestamp": time.time(), "endpoints": {}}
@@ -410,13 +566,15 @@ class TradingViewAPI:
         healthy_count = 0
         total_endpoints = len(unique_endpoints)
 
-        for endpoint in unique_endpoints:
-            try:
-                await self.get_metainfo(endpoint)
+        # Запросы к эндпоинтам независимы - выполняем их параллельно
+        endpoints = list(unique_endpoints)
+        results = await asyncio.gather(*(self.get_metainfo(endpoint) for endpoint in endpoints), return_exceptions=True)
+        for endpoint, result in zip(endpoints, results):
+            if isinstance(result, Exception):
+                health_status["endpoints"][endpoint] = f"unhealthy: {result}"
+            else:
                 health_status["endpoints"][endpoint] = "healthy"
                 healthy_count += 1
-            except Exception as e:
-                health_status["endpoints"][endpoint] = f"unhealthy: {e}"
 
         # Определяем общий статус
         if healthy_count == total_endpoints:
@@ -2,7 +2,6 @@
 Configuration module for tv-generator.
 """
 
-import json
 import os
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -10,6 +9,8 @@ from typing import Any, Dict, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .json_io import loads, write_json
+
 
 class Config:
     """Конфигурация tv-generator."""
@@ -21,8 +22,7 @@ class Config:
     def _load_config(self) -> dict[str, Any]:
         """Загружает конфигурацию из файла."""
         if self.config_path.exists():
-            with open(self.config_path, encoding="utf-8") as f:
-                return json.load(f)
+            return loads(self.config_path.read_bytes())
         else:
             return self._get_default_config()
 
@@ -39,8 +39,7 @@ class Config:
     def save(self) -> None:
         """Сохраняет конфигурацию в файл."""
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.config_path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        write_json(self.config_path, self.data, indent=True, durable=True)
 
     def get(self, key: str, default: Any = None) -> Any:
         """Получает значение конфигурации по ключу."""
@@ -83,6 +82,15 @@ class Settings(BaseSettings):
     requests_per_second: int = Field(default=2, description="Rate limit: requests per second")
     burst_limit: int = Field(default=10, description="Rate limit: burst limit")
     window_size: float = Field(default=60.0, description="Rate limit: sliding window size in seconds")
+    http2: bool = Field(default=False, description="Use HTTP/2 when the h2 package is installed")
+
+    # Schema generation: проверка pydantic-моделями выключена в рабочих прогонах, тесты включают VALIDATE_MODELS=1
+    validate_models: bool = Field(
+        default=False, description="Validate metainfo fields and filters with pydantic models before building schemas"
+    )
+    generation_workers: int = Field(
+        default=1, ge=1, description="Worker processes for spec generation; 1 generates markets serially"
+    )
 
     # Data directories
     data_dir: str = Field(default="data", description="Directory for data files")
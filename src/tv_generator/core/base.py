@@ -27,17 +27,17 @@ class BaseSchemaGenerator(ABC):
 
     @abstractmethod
     def generate_field_schema(self, field: dict[str, Any], market: str | None = None) -> dict[str, Any]:
-        logger.debug(f"Called generate_field_schema with field={field}, market={market}")
+        logger.debug("Called generate_field_schema with field=%s, market=%s", field, market)
         pass
 
     @abstractmethod
     def generate_filter_schema(self, metainfo: dict[str, Any]) -> dict[str, Any]:
-        logger.debug(f"Called generate_filter_schema with metainfo={metainfo}")
+        logger.debug("Called generate_filter_schema with metainfo=%s", metainfo)
         pass
 
     @abstractmethod
     def generate_request_body_schema(self, fields: dict[str, Any], filters: dict[str, Any]) -> dict[str, Any]:
-        logger.debug(f"Called generate_request_body_schema with fields={fields}, filters={filters}")
+        logger.debug("Called generate_request_body_schema with fields=%s, filters=%s", fields, filters)
         pass
 
 
@@ -46,17 +46,17 @@ class BaseValidator(ABC):
 
     @abstractmethod
     def validate_field(self, field: dict[str, Any]) -> bool:
-        logger.debug(f"Called validate_field with field={field}")
+        logger.debug("Called validate_field with field=%s", field)
         pass
 
     @abstractmethod
     def validate_schema(self, schema: dict[str, Any]) -> bool:
-        logger.debug(f"Called validate_schema with schema={schema}")
+        logger.debug("Called validate_schema with schema=%s", schema)
         pass
 
     @abstractmethod
     def validate_example(self, example: Any, schema_type: str) -> bool:
-        logger.debug(f"Called validate_example with example={example}, schema_type={schema_type}")
+        logger.debug("Called validate_example with example=%s, schema_type=%s", example, schema_type)
         pass
 
 
@@ -65,17 +65,17 @@ class BaseCache(ABC):
 
     @abstractmethod
     async def get(self, key: str) -> Any | None:
-        logger.debug(f"Called get with key={key}")
+        logger.debug("Called get with key=%s", key)
         pass
 
     @abstractmethod
     async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
-        logger.debug(f"Called set with key={key}, value={value}, ttl={ttl}")
+        logger.debug("Called set with key=%s, value=%s, ttl=%s", key, value, ttl)
         pass
 
     @abstractmethod
     async def delete(self, key: str) -> None:
-        logger.debug(f"Called delete with key={key}")
+        logger.debug("Called delete with key=%s", key)
         pass
 
     @abstractmethod
@@ -89,20 +89,20 @@ class BaseFileManager(ABC):
 
     @abstractmethod
     async def save_spec(self, market: str, spec: dict[str, Any]) -> None:
-        logger.debug(f"Called save_spec with market={market}, spec={spec}")
+        logger.debug("Called save_spec with market=%s, spec=%s", market, spec)
         pass
 
     @abstractmethod
     async def load_metainfo(self, market: str) -> dict[str, Any]:
-        logger.debug(f"Called load_metainfo with market={market}")
+        logger.debug("Called load_metainfo with market=%s", market)
         pass
 
     @abstractmethod
     async def load_scan_data(self, market: str) -> list[dict[str, Any]]:
-        logger.debug(f"Called load_scan_data with market={market}")
+        logger.debug("Called load_scan_data with market=%s", market)
         pass
 
     @abstractmethod
     async def ensure_directory(self, path: Path) -> None:
-        logger.debug(f"Called ensure_directory with path={path}")
+        logger.debug("Called ensure_directory with path=%s", path)
         pass
@@ -3,7 +3,6 @@ Caching system for OpenAPI generator.
 """
 
 import asyncio
-import json
 import time
 from collections import OrderedDict
 from pathlib import Path
@@ -11,6 +10,7 @@ from typing import Any, Dict, Optional
 
 from loguru import logger
 
+from ..json_io import dumps, loads
 from .base import BaseCache
 
 
@@ -22,13 +22,13 @@ class MemoryCache(BaseCache):
         self.ttl = ttl
         self.cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
 
-    async def get(self, key: str) -> Any | None:
+    async def get(self, key: str, now: float | None = None) -> Any | None:
         """Get value from memory cache."""
         if key not in self.cache:
             return None
 
         item = self.cache[key]
-        if time.time() - item["timestamp"] > self.ttl:
+        if (time.time() if now is None else now) - item["timestamp"] > self.ttl:
             await self.delete(key)
             return None
 
@@ -66,22 +66,20 @@ class DiskCache(BaseCache):
         """Get cache file path for key."""
         return self.cache_dir / f"{key}.json"
 
-    async def get(self, key: str) -> Any | None:
+    async def get(self, key: str, now: float | None = None) -> Any | None:
         """Get value from disk cache."""
         cache_path = self._get_cache_path(key)
 
-        if not cache_path.exists():
-            return None
-
         try:
-            with open(cache_path, encoding="utf-8") as f:
-                data = json.load(f)
+            data = loads(cache_path.read_bytes())
 
-            if time.time() - data["timestamp"] > data["ttl"]:
+            if (time.time() if now is None else now) - data["timestamp"] > data["ttl"]:
                 await self.delete(key)
                 return None
 
             return data["value"]
+        except FileNotFoundError:
+            return None
         except Exception as e:
             logger.warning(f"Failed to load cache for key {key}: {e}")
             return None
@@ -93,21 +91,45 @@ class DiskCache(BaseCache):
         try:
             data = {"value": value, "timestamp": time.time(), "ttl": ttl or self.ttl}
 
-            with open(cache_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Кэш читается только программой, поэтому пишется компактный JSON
+            cache_path.write_bytes(dumps(data))
         except Exception as e:
             logger.error(f"Failed to save cache for key {key}: {e}")
 
     async def delete(self, key: str) -> None:
         """Delete value from disk cache."""
-        cache_path = self._get_cache_path(key)
-        if cache_path.exists():
-            cache_path.unlink()
+        self._unlink(self._get_cache_path(key))
 
     async def clear(self) -> None:
         """Clear all cache."""
         for cache_file in self.cache_dir.glob("*.json"):
-            cache_file.unlink()
+            self._unlink(cache_file)
+
+    async def purge_expired(self, now: float | None = None) -> int:
+        """Remove expired and unreadable entries so the cache directory does not grow without bound."""
+        now = time.time() if now is None else now
+        removed = 0
+        for cache_file in self.cache_dir.glob("*.json"):
+            try:
+                data = loads(cache_file.read_bytes())
+                expired = now - data["timestamp"] > data["ttl"]
+            except FileNotFoundError:
+                continue
+            except Exception:
+                expired = True
+            if expired:
+                self._unlink(cache_file)
+                removed += 1
+        return removed
+
+    def _unlink(self, cache_path: Path) -> None:
+        """Remove cache file, tolerating files already removed by a concurrent writer."""
+        try:
+            cache_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove cache file {cache_path}: {e}")
 
 
 class APICache(BaseCache):
@@ -117,13 +139,13 @@ class APICache(BaseCache):
         self.ttl = ttl
         self.cache: dict[str, dict[str, Any]] = {}
 
-    async def get(self, key: str) -> Any | None:
+    async def get(self, key: str, now: float | None = None) -> Any | None:
         """Get value from API cache."""
         if key not in self.cache:
             return None
 
         item = self.cache[key]
-        if time.time() - item["timestamp"] > self.ttl:
+        if (time.time() if now is None else now) - item["timestamp"] > self.ttl:
             await self.delete(key)
             return None
 
@@ -152,20 +174,23 @@ class MultiLevelCache:
 
     async def get(self, key: str) -> Any | None:
         """Get value from multi-level cache."""
+        # Single wall-clock snapshot for all expiry checks of this lookup
+        now = time.time()
+
         # Try memory cache first
-        value = await self.memory_cache.get(key)
+        value = await self.memory_cache.get(key, now)
         if value is not None:
             return value
 
         # Try disk cache
-        value = await self.disk_cache.get(key)
+        value = await self.disk_cache.get(key, now)
         if value is not None:
             # Store in memory cache for faster access
             await self.memory_cache.set(key, value)
             return value
 
         # Try API cache
-        value = await self.api_cache.get(key)
+        value = await self.api_cache.get(key, now)
         if value is not None:
             # Store in memory and disk cache
             await self.memory_cache.set(key, value)
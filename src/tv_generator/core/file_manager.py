@@ -2,14 +2,14 @@
 Async file manager for OpenAPI generator.
 """
 
-import asyncio
-import json
+import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import aiofiles
 from loguru import logger
 
+from ..json_io import dumps, loads
 from .base import BaseFileManager
 
 
@@ -21,11 +21,13 @@ class AsyncFileManager(BaseFileManager):
         self.specs_dir = specs_dir
         self.metainfo_dir = data_dir / "metainfo"
         self.scan_dir = data_dir / "scan"
+        # Per-market file paths are built from these plain strings
+        self._metainfo_prefix = os.path.join(self.metainfo_dir, "")
+        self._scan_prefix = os.path.join(self.scan_dir, "")
 
-        # Ensure directories exist
-        asyncio.create_task(self.ensure_directory(self.specs_dir))
-        asyncio.create_task(self.ensure_directory(self.metainfo_dir))
-        asyncio.create_task(self.ensure_directory(self.scan_dir))
+        # Ensure directories exist (one makedirs per unique leaf)
+        for directory in {self.specs_dir, self.metainfo_dir, self.scan_dir}:
+            os.makedirs(directory, exist_ok=True)
 
     async def ensure_directory(self, path: Path) -> None:
         """Ensure directory exists."""
@@ -40,8 +42,8 @@ class AsyncFileManager(BaseFileManager):
         spec_path = self.specs_dir / f"{market}_openapi.json"
 
         try:
-            async with aiofiles.open(spec_path, "w", encoding="utf-8") as f:
-                await f.write(json.dumps(spec, indent=2, ensure_ascii=False))
+            async with aiofiles.open(spec_path, "wb") as f:
+                await f.write(dumps(spec, indent=True))
             logger.info(f"Saved OpenAPI spec for {market}")
         except Exception as e:
             logger.error(f"Failed to save spec for {market}: {e}")
@@ -49,28 +51,27 @@ class AsyncFileManager(BaseFileManager):
 
     async def load_metainfo(self, market: str) -> dict[str, Any]:
         """Load market metainfo from file."""
-        metainfo_path = self.metainfo_dir / f"{market}.json"
-        if not metainfo_path.exists():
-            logger.warning(f"Metainfo file not found for {market}: {metainfo_path}")
-            return {}
+        metainfo_path = f"{self._metainfo_prefix}{market}.json"
         try:
-            async with aiofiles.open(metainfo_path, "r", encoding="utf-8") as f:
-                content = await f.read()
-                data = json.loads(content)
+            async with aiofiles.open(metainfo_path, "rb") as f:
+                data = loads(await f.read())
                 if isinstance(data, list):
                     return {"fields": data}
                 return data
+        except FileNotFoundError:
+            logger.warning(f"Metainfo file not found for {market}: {metainfo_path}")
+            return {}
         except Exception as e:
             logger.error(f"Failed to load metainfo for {market}: {e}")
             return {}
 
     async def save_metainfo(self, market: str, metainfo: dict[str, Any]) -> None:
         """Save market metainfo to file."""
-        metainfo_path = self.metainfo_dir / f"{market}.json"
+        metainfo_path = f"{self._metainfo_prefix}{market}.json"
 
         try:
-            async with aiofiles.open(metainfo_path, "w", encoding="utf-8") as f:
-                await f.write(json.dumps(metainfo, indent=2, ensure_ascii=False))
+            async with aiofiles.open(metainfo_path, "wb") as f:
+                await f.write(dumps(metainfo, indent=True))
             logger.info(f"Saved metainfo for {market}")
         except Exception as e:
             logger.error(f"Failed to save metainfo for {market}: {e}")
@@ -78,29 +79,27 @@ class AsyncFileManager(BaseFileManager):
 
     async def load_scan_data(self, market: str) -> list[dict[str, Any]]:
         """Load market scan data from file."""
-        scan_path = self.scan_dir / f"{market}.json"
-
-        if not scan_path.exists():
-            logger.warning(f"Scan file not found for {market}: {scan_path}")
-            return []
+        scan_path = f"{self._scan_prefix}{market}.json"
 
         try:
-            async with aiofiles.open(scan_path, "r", encoding="utf-8") as f:
-                content = await f.read()
-                data = json.loads(content)
+            async with aiofiles.open(scan_path, "rb") as f:
+                data = loads(await f.read())
                 return data.get("data", []) if isinstance(data, dict) else data
+        except FileNotFoundError:
+            logger.warning(f"Scan file not found for {market}: {scan_path}")
+            return []
         except Exception as e:
             logger.error(f"Failed to load scan data for {market}: {e}")
             return []
 
     async def save_scan_data(self, market: str, scan_data: list[dict[str, Any]]) -> None:
         """Save market scan data to file."""
-        scan_path = self.scan_dir / f"{market}.json"
+        scan_path = f"{self._scan_prefix}{market}.json"
 
         try:
             data = {"data": scan_data, "totalCount": len(scan_data)}
-            async with aiofiles.open(scan_path, "w", encoding="utf-8") as f:
-                await f.write(json.dumps(data, indent=2, ensure_ascii=False))
+            async with aiofiles.open(scan_path, "wb") as f:
+                await f.write(dumps(data, indent=True))
             logger.info(f"Saved scan data for {market}")
         except Exception as e:
             logger.error(f"Failed to save scan data for {market}: {e}")
@@ -115,9 +114,8 @@ class AsyncFileManager(BaseFileManager):
             return []
 
         try:
-            async with aiofiles.open(markets_path, "r", encoding="utf-8") as f:
-                content = await f.read()
-                data = json.loads(content)
+            async with aiofiles.open(markets_path, "rb") as f:
+                data = loads(await f.read())
 
                 if isinstance(data, list):
                     return data
@@ -134,8 +132,8 @@ class AsyncFileManager(BaseFileManager):
         markets_path = self.data_dir / "markets.json"
 
         try:
-            async with aiofiles.open(markets_path, "w", encoding="utf-8") as f:
-                await f.write(json.dumps(markets, indent=2, ensure_ascii=False))
+            async with aiofiles.open(markets_path, "wb") as f:
+                await f.write(dumps(markets, indent=True))
             logger.info(f"Saved {len(markets)} markets")
         except Exception as e:
             logger.error(f"Failed to save markets: {e}")
@@ -150,9 +148,8 @@ class AsyncFileManager(BaseFileManager):
             return {}
 
         try:
-            async with aiofiles.open(display_names_path, "r", encoding="utf-8") as f:
-                content = await f.read()
-                data = json.loads(content)
+            async with aiofiles.open(display_names_path, "rb") as f:
+                data = loads(await f.read())
                 return data if isinstance(data, dict) else {}
         except Exception as e:
             logger.error(f"Failed to load display names: {e}")
@@ -163,8 +160,8 @@ class AsyncFileManager(BaseFileManager):
         display_names_path = self.data_dir / "column_display_names.json"
 
         try:
-            async with aiofiles.open(display_names_path, "w", encoding="utf-8") as f:
-                await f.write(json.dumps(display_names, indent=2, ensure_ascii=False))
+            async with aiofiles.open(display_names_path, "wb") as f:
+                await f.write(dumps(display_names, indent=True))
             logger.info(f"Saved {len(display_names)} display names")
         except Exception as e:
             logger.error(f"Failed to save display names: {e}")
@@ -10,6 +10,8 @@ from typing import Dict, List, Optional
 import psutil
 from loguru import logger
 
+from ..json_io import dumps
+
 
 @dataclass
 class GenerationMetrics:
@@ -33,6 +35,8 @@ class MetricsCollector:
         self.metrics: list[GenerationMetrics] = []
         self.start_time: float | None = None
         self.process = psutil.Process()
+        # Number of metrics already written by append_metrics
+        self._appended = 0
 
     def start_generation(self) -> None:
         """Start timing generation process."""
@@ -63,23 +67,35 @@ class MetricsCollector:
         if not self.metrics:
             return {}
 
-        successful = [m for m in self.metrics if m.success]
-        failed = [m for m in self.metrics if not m.success]
-
-        total_duration = sum(m.duration for m in self.metrics)
-        avg_memory = sum(m.memory_usage for m in self.metrics) / len(self.metrics)
+        # Все суммы собираются за один проход по метрикам
+        total = len(self.metrics)
+        successful = 0
+        total_duration = 0
+        total_memory = 0
+        max_memory = self.metrics[0].memory_usage
+        total_api_calls = 0
+        total_fields = 0
+        for m in self.metrics:
+            if m.success:
+                successful += 1
+            total_duration += m.duration
+            total_memory += m.memory_usage
+            if m.memory_usage > max_memory:
+                max_memory = m.memory_usage
+            total_api_calls += m.api_calls
+            total_fields += m.fields_processed
 
         return {
-            "total_generations": len(self.metrics),
-            "successful": len(successful),
-            "failed": len(failed),
-            "success_rate": len(successful) / len(self.metrics) if self.metrics else 0,
+            "total_generations": total,
+            "successful": successful,
+            "failed": total - successful,
+            "success_rate": successful / total,
             "total_duration": total_duration,
-            "avg_duration": total_duration / len(self.metrics) if self.metrics else 0,
-            "avg_memory_usage": avg_memory,
-            "max_memory_usage": max(m.memory_usage for m in self.metrics) if self.metrics else 0,
-            "total_api_calls": sum(m.api_calls for m in self.metrics),
-            "total_fields_processed": sum(m.fields_processed for m in self.metrics),
+            "avg_duration": total_duration / total,
+            "avg_memory_usage": total_memory / total,
+            "max_memory_usage": max_memory,
+            "total_api_calls": total_api_calls,
+            "total_fields_processed": total_fields,
         }
 
     def get_market_metrics(self, market: str) -> GenerationMetrics | None:
@@ -93,37 +109,51 @@ class MetricsCollector:
         """Clear all metrics."""
         self.metrics.clear()
         self.start_time = None
+        self._appended = 0
 
     def export_metrics(self, file_path: str) -> None:
-        """Export metrics to JSON file."""
-        import json
-
-        summary = self.get_summary()
-        metrics_data = {
-            "summary": summary,
-            "detailed_metrics": [
-                {
-                    "market": m.market,
-                    "fields_processed": m.fields_processed,
-                    "duration": m.duration,
-                    "memory_usage": m.memory_usage,
-                    "api_calls": m.api_calls,
-                    "success": m.success,
-                    "timestamp": m.timestamp.isoformat(),
-                    "errors": m.errors,
-                    "warnings": m.warnings,
-                }
-                for m in self.metrics
-            ],
-        }
-
+        """Export metrics to JSON file, streaming one metric per line."""
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(metrics_data, f, indent=2, ensure_ascii=False)
+            with open(file_path, "wb", buffering=1 << 16) as f:
+                f.writelines(self._iter_metrics_json())
             logger.info(f"Metrics exported to {file_path}")
         except Exception as e:
             logger.error(f"Failed to export metrics: {e}")
 
+    def append_metrics(self, file_path: str) -> None:
+        """Append metrics recorded since the previous call to a JSON Lines history file."""
+        pending = self.metrics[self._appended :]
+        if not pending:
+            return
+        try:
+            with open(file_path, "ab") as f:
+                f.write(b"".join(dumps(self._metric_entry(m)) + b"\n" for m in pending))
+            self._appended = len(self.metrics)
+            logger.info(f"Appended {len(pending)} metrics to {file_path}")
+        except Exception as e:
+            logger.error(f"Failed to append metrics: {e}")
+
+    @staticmethod
+    def _metric_entry(m: GenerationMetrics) -> dict:
+        return {
+            "market": m.market,
+            "fields_processed": m.fields_processed,
+            "duration": m.duration,
+            "memory_usage": m.memory_usage,
+            "api_calls": m.api_calls,
+            "success": m.success,
+            "timestamp": m.timestamp.isoformat(),
+            "errors": m.errors,
+            "warnings": m.warnings,
+        }
+
+    def _iter_metrics_json(self):
+        """Yield the metrics report as JSON byte chunks without building the full document."""
+        yield b'{\n  "summary": ' + dumps(self.get_summary()) + b',\n  "detailed_metrics": ['
+        for i, m in enumerate(self.metrics):
+            yield (b"," if i else b"") + b"\n    " + dumps(self._metric_entry(m))
+        yield b"\n  ]\n}\n"
+
 
 class PerformanceMonitor:
     """Performance monitoring utilities."""
@@ -4,8 +4,9 @@ Parallel pipeline for concurrent OpenAPI generation.
 
 import asyncio
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, AsyncIterator, Dict, List, Optional, Callable
 
 from loguru import logger
 
@@ -14,6 +15,50 @@ from .metrics import GenerationMetrics, MetricsCollector
 from ..main import OpenAPIPipeline
 
 
+def _ichunks(items, size: int):
+    """Lazily yield consecutive lists of up to size items; only the current chunk is materialized."""
+    it = iter(items)
+    return iter(lambda: list(islice(it, size)), [])
+
+
+class DynamicLimiter:
+    """Concurrency limiter whose limit can be changed while tasks are waiting."""
+
+    def __init__(self, concurrency: int):
+        self._concurrency = concurrency
+        self._active = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self._concurrency)
+            self._active += 1
+
+    async def release(self) -> None:
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+
+    async def set_concurrency(self, concurrency: int) -> None:
+        """Change the limit; raising it wakes up waiting tasks immediately."""
+        if concurrency < 1:
+            raise ValueError(f"Concurrency must be positive, got {concurrency}")
+        async with self._cond:
+            self._concurrency = concurrency
+            self._cond.notify_all()
+
+    async def __aenter__(self) -> "DynamicLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.release()
+
+
 class ParallelOpenAPIPipeline(OpenAPIPipeline):
     """Parallel pipeline for generating OpenAPI specifications."""
 
@@ -22,11 +67,16 @@ class ParallelOpenAPIPipeline(OpenAPIPipeline):
         super().__init__(**kwargs)
         self.max_concurrent = max_concurrent
         self.chunk_size = chunk_size
-        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.limiter = DynamicLimiter(max_concurrent)
+
+    async def set_concurrency(self, max_concurrent: int) -> None:
+        """Adjust the number of markets generated concurrently at runtime."""
+        await self.limiter.set_concurrency(max_concurrent)
+        self.max_concurrent = max_concurrent
 
     async def _generate_spec_with_semaphore(self, market: str) -> tuple[str, bool, str | None]:
-        """Generate spec with semaphore to limit concurrency."""
-        async with self.semaphore:
+        """Generate spec with the limiter bounding concurrency."""
+        async with self.limiter:
             try:
                 success = await self.generate_and_save_spec(market)
                 return market, success, None
@@ -35,23 +85,25 @@ class ParallelOpenAPIPipeline(OpenAPIPipeline):
                 logger.error(error_msg)
                 return market, False, error_msg
 
+    async def _iter_chunk_results(self, markets_chunk: list[str]) -> AsyncIterator[tuple[str, bool, str | None]]:
+        """Yield results for a chunk of markets as soon as each one finishes."""
+        tasks = {asyncio.create_task(self._generate_spec_with_semaphore(market)): market for market in markets_chunk}
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                market = tasks.pop(task)
+                error = task.exception()
+                if error is None:
+                    yield task.result()
+                else:
+                    error_msg = f"Exception for {market}: {error}"
+                    logger.error(error_msg)
+                    yield market, False, error_msg
+
     async def _process_chunk(self, markets_chunk: list[str]) -> list[tuple[str, bool, str | None]]:
         """Process a chunk of markets concurrently."""
-        tasks = [self._generate_spec_with_semaphore(market) for market in markets_chunk]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Handle exceptions
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                market = markets_chunk[i]
-                error_msg = f"Exception for {market}: {result}"
-                logger.error(error_msg)
-                processed_results.append((market, False, error_msg))
-            else:
-                processed_results.append(result)
-
-        return processed_results
+        return [result async for result in self._iter_chunk_results(markets_chunk)]
 
     async def generate_all_specs_parallel(self) -> OpenAPIGeneratorResult:
         """Generate OpenAPI specifications for all markets in parallel."""
@@ -74,32 +126,31 @@ class ParallelOpenAPIPipeline(OpenAPIPipeline):
             )
 
             # Split markets into chunks
-            chunks = [markets[i : i + self.chunk_size] for i in range(0, len(markets), self.chunk_size)]
-            logger.info(f"Split into {len(chunks)} chunks of size {self.chunk_size}")
+            num_chunks = -(-len(markets) // self.chunk_size)
+            logger.info(f"Split into {num_chunks} chunks of size {self.chunk_size}")
 
-            # Process chunks sequentially, but markets within chunks concurrently
-            all_results = []
+            # Process chunks sequentially, but markets within chunks concurrently.
+            # Results are counted as they complete and not retained.
             successful_generations = 0
             failed_generations = 0
             errors = []
 
-            for i, chunk in enumerate(chunks):
-                logger.info(f"Processing chunk {i + 1}/{len(chunks)} with {len(chunk)} markets")
-                chunk_results = await self._process_chunk(chunk)
-                all_results.extend(chunk_results)
+            for i, chunk in enumerate(_ichunks(markets, self.chunk_size)):
+                logger.info(f"Processing chunk {i + 1}/{num_chunks} with {len(chunk)} markets")
+                chunk_successful = 0
+                chunk_failed = 0
 
-                # Update counters
-                for market, success, error in chunk_results:
+                async for market, success, error in self._iter_chunk_results(chunk):
                     if success:
-                        successful_generations += 1
+                        chunk_successful += 1
                     else:
-                        failed_generations += 1
+                        chunk_failed += 1
                         if error:
                             errors.append(error)
 
-                logger.info(
-                    f"Chunk {i + 1} completed: {len([r for r in chunk_results if r[1]])} successful, {len([r for r in chunk_results if not r[1]])} failed"
-                )
+                successful_generations += chunk_successful
+                failed_generations += chunk_failed
+                logger.info(f"Chunk {i + 1} completed: {chunk_successful} successful, {chunk_failed} failed")
 
             # Get metrics summary
             metrics_summary = self.metrics_collector.get_summary()
@@ -282,6 +333,7 @@ class ParallelOpenAPIPipeline(OpenAPIPipeline):
 
     async def get_generation_stats(self) -> dict[str, Any]:
         """Get generation statistics."""
+        timestamp = datetime.now().isoformat()
         try:
             markets = await self.load_markets()
             metrics_summary = self.metrics_collector.get_summary()
@@ -291,11 +343,11 @@ class ParallelOpenAPIPipeline(OpenAPIPipeline):
                 "max_concurrent": self.max_concurrent,
                 "chunk_size": self.chunk_size,
                 "metrics": metrics_summary,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
             }
         except Exception as e:
             logger.error(f"Error getting generation stats: {e}")
             return {
                 "error": str(e),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
             }
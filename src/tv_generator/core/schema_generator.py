@@ -6,11 +6,30 @@ from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
+from ..config import settings
 from .base import BaseSchemaGenerator
 from .example_utils import extract_enum_values, generate_field_example
 from .models import TVField, TVFilter
 from .utils import log_and_catch
 
+TV_TYPE_TO_OPENAPI = {
+    "number": "number",
+    "price": "number",
+    "percent": "number",
+    "integer": "integer",
+    "string": "string",
+    "text": "string",
+    "boolean": "boolean",
+    "time": "string",
+    "set": "array",
+    "map": "object",
+}
+
+# JSON-схема pydantic-модели одинакова для всех экземпляров, поэтому строится один раз;
+# генераторы получают поверхностную копию и меняют только ключи верхнего уровня
+TV_FIELD_SCHEMA = TVField.model_json_schema()
+TV_FILTER_SCHEMA = TVFilter.model_json_schema()
+
 
 class SchemaGenerator(BaseSchemaGenerator):
     """
@@ -28,24 +47,14 @@ class SchemaGenerator(BaseSchemaGenerator):
         self.debug_trace = self.config.get("debug_trace", False)
         self.include_examples = self.config.get("include_examples", False)
         self.require_examples = self.config.get("require_examples", False)
+        # Без валидации имена берутся из сырых dict metainfo, минуя построение pydantic-моделей
+        self.validate_models = self.config.get("validate_models", settings.validate_models)
         self.compact = compact
         self.max_fields = max_fields
 
     def _map_tradingview_type_to_openapi(self, tv_type: str) -> str:
         """Map TradingView field type to OpenAPI type."""
-        type_mapping = {
-            "number": "number",
-            "price": "number",
-            "percent": "number",
-            "integer": "integer",
-            "string": "string",
-            "text": "string",
-            "boolean": "boolean",
-            "time": "string",
-            "set": "array",
-            "map": "object",
-        }
-        return type_mapping.get(tv_type, "string")
+        return TV_TYPE_TO_OPENAPI.get(tv_type, "string")
 
     def _validate_example_type(self, example: Any, openapi_type: str) -> bool:
         """Validate that example matches OpenAPI type."""
@@ -94,11 +103,11 @@ class SchemaGenerator(BaseSchemaGenerator):
         В случае ошибки возвращает дефолтную строковую схему с описанием ошибки.
         """
         try:
-            tv_field = TVField(**field)
-            schema = tv_field.schema()
-            schema["title"] = tv_field.n
+            field_name = TVField.model_validate(field).n if self.validate_models else field["n"]
+            schema = dict(TV_FIELD_SCHEMA)
+            schema["title"] = field_name
             if not self.compact:
-                schema["description"] = f"Field: {tv_field.n}"
+                schema["description"] = f"Field: {field_name}"
 
             # Обрезаем длинные enum
             if "enum" in schema and isinstance(schema["enum"], list) and len(schema["enum"]) > 3:
@@ -107,7 +116,7 @@ class SchemaGenerator(BaseSchemaGenerator):
             # Конвертируем example в examples для GPT Builder
             if "example" in schema and not self.compact:
                 example_value = schema.pop("example")
-                examples_data = self._convert_example_to_examples(example_value, tv_field.n)
+                examples_data = self._convert_example_to_examples(example_value, field_name)
                 schema.update(examples_data)
 
             return schema
@@ -135,18 +144,22 @@ class SchemaGenerator(BaseSchemaGenerator):
         required = []
         for filter_name, filter_data in filters.items():
             try:
-                tv_filter = TVFilter(**filter_data)
-                property_schema = tv_filter.schema()
-                property_schema["title"] = tv_filter.n
-                property_schema["description"] = f"Filter: {tv_filter.n}"
+                if self.validate_models:
+                    tv_filter = TVFilter.model_validate(filter_data)
+                    filter_title, filter_required = tv_filter.n, tv_filter.required
+                else:
+                    filter_title, filter_required = filter_data["n"], filter_data.get("required", False)
+                property_schema = dict(TV_FILTER_SCHEMA)
+                property_schema["title"] = filter_title
+                property_schema["description"] = f"Filter: {filter_title}"
 
                 # Конвертируем example в examples для GPT Builder
                 if "example" in property_schema:
                     example_value = property_schema.pop("example")
-                    examples_data = self._convert_example_to_examples(example_value, tv_filter.n)
+                    examples_data = self._convert_example_to_examples(example_value, filter_title)
                     property_schema.update(examples_data)
 
-                if tv_filter.required:
+                if filter_required:
                     required.append(filter_name)
                 properties[filter_name] = property_schema
             except Exception as e:
@@ -280,9 +293,11 @@ class SchemaGenerator(BaseSchemaGenerator):
         """Generate field schemas from metainfo."""
         try:
             # Отладочная информация
-            logger.debug(f"[schema_generator] generate_field_schemas called with type: {type(metainfo)}")
-            logger.debug(
-                f"[schema_generator] metainfo keys: {list(metainfo.keys()) if isinstance(metainfo, dict) else 'not dict'}"
+            logger.debug("[schema_generator] generate_field_schemas called with type: {}", type(metainfo))
+            # Список ключей строится только при включённом DEBUG
+            logger.opt(lazy=True).debug(
+                "[schema_generator] metainfo keys: {}",
+                lambda: list(metainfo.keys()) if isinstance(metainfo, dict) else "not dict",
             )
 
             fields = metainfo.get("fields", {})
@@ -8,6 +8,11 @@ from loguru import logger
 
 from .base import BaseValidator
 
+VALID_FIELD_TYPES = frozenset(
+    {"number", "price", "percent", "integer", "string", "text", "boolean", "time", "set", "map"}
+)
+VALID_SCHEMA_TYPES = frozenset({"object", "array", "string", "number", "integer", "boolean", "null"})
+
 
 class Validator(BaseValidator):
     """Standard validator implementation."""
@@ -28,8 +33,7 @@ class Validator(BaseValidator):
                 return False
 
             # Validate field type
-            valid_types = ["number", "price", "percent", "integer", "string", "text", "boolean", "time", "set", "map"]
-            if field["t"] not in valid_types:
+            if field["t"] not in VALID_FIELD_TYPES:
                 logger.warning(f"Field {field['n']} has invalid type: {field['t']}")
                 return False
 
@@ -47,8 +51,7 @@ class Validator(BaseValidator):
                 return False
 
             # Validate schema type
-            valid_types = ["object", "array", "string", "number", "integer", "boolean", "null"]
-            if schema["type"] not in valid_types:
+            if schema["type"] not in VALID_SCHEMA_TYPES:
                 logger.warning(f"Schema has invalid type: {schema['type']}")
                 return False
 
@@ -0,0 +1,78 @@
+"""
+JSON helpers with optional orjson acceleration.
+"""
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to stdlib json
+    orjson = None
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=64)
+def _load_json_file(path: str, mtime_ns: int, size: int) -> Any:
+    return loads(Path(path).read_bytes())
+
+
+def load_json_cached(path: str | os.PathLike) -> Any:
+    """
+    Parse a JSON file, reusing the previous result while its mtime and size are unchanged.
+
+    The returned object is shared between callers and must not be mutated.
+    """
+    path = os.fspath(path)
+    st = os.stat(path)
+    return _load_json_file(path, st.st_mtime_ns, st.st_size)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize object to UTF-8 JSON bytes, keeping non-ASCII characters as is."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_json(path: str | os.PathLike, obj: Any, indent: bool = False, durable: bool = False) -> None:
+    """
+    Serialize object once and publish it atomically.
+
+    The bytes go straight to a temporary file descriptor in the target directory,
+    which is then renamed over path, so readers never see a partially written file.
+    With durable=True the data is fsync'ed before the rename; the normal path skips it.
+    """
+    path = os.fspath(path)
+    view = memoryview(dumps(obj, indent=indent))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            while view:
+                view = view[os.write(fd, view) :]
+            if durable:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
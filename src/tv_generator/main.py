@@ -5,9 +5,10 @@ Main logic for processing TradingView API data.
 """
 
 import asyncio
-import json
 import logging
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from functools import wraps
 from pathlib import Path
@@ -16,8 +17,15 @@ from typing import Any, Dict, List, Optional
 from loguru import logger
 
 from .api import TradingViewAPI
+from .config import settings
+from .json_io import load_json_cached, loads, write_json
 from .types import MarketData, OpenAPIGeneratorResult
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional and not available on Windows
+    uvloop = None
+
 # Data versions and sources
 DATA_VERSION = "2.0.0"
 METAINFO_SOURCE = "tv-screener"
@@ -26,6 +34,103 @@ GENERATOR_VERSION = "2.0.0"
 DATA_SOURCE = "tv-screener"
 GENERATION_DATE = datetime.now().isoformat()
 
+# TradingView field type -> OpenAPI type; unknown types map to "string"
+TV_TYPE_TO_OPENAPI = {
+    "number": "number",
+    "price": "number",
+    "percent": "number",
+    "integer": "integer",
+    "string": "string",
+    "text": "string",
+    "bool": "boolean",
+    "boolean": "boolean",
+    "time": "string",
+    "set": "array",
+    "map": "object",
+    "num_slice": "number",
+    "fundamental_price": "number",
+}
+# Bound lookup for the per-field hot path: _map_tv_type(tv_type, "string")
+_map_tv_type = TV_TYPE_TO_OPENAPI.get
+
+# Точные Python-типы значений из JSON для каждого OpenAPI-типа. Сравнение type(x) in ...
+# отсекает bool для number/integer без отдельной проверки (JSON не порождает подклассы).
+EXAMPLE_PY_TYPES = {
+    "string": (str,),
+    "number": (int, float),
+    "integer": (int,),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+}
+
+# Static request body sub-schemas. They are shared by reference between
+# generated specs, which are treated as read-only once built.
+FILTER_SCHEMA = {
+    "type": "object",
+    "description": "Filter object with various criteria",
+    "properties": {
+        "field": {"type": "string", "description": "Field name to filter by"},
+        "value": {"type": "string", "description": "Filter value"},
+        "operator": {
+            "type": "string",
+            "enum": [">", "<", ">=", "<=", "=", "!="],
+            "description": "Comparison operator",
+        },
+    },
+}
+FILTERS_SCHEMA = {"type": "array", "items": FILTER_SCHEMA}
+SYMBOLS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "query": {
+            "type": "object",
+            "properties": {
+                "types": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "examples": {"default": {"summary": "Example types", "value": ["stock"]}},
+                }
+            },
+        }
+    },
+}
+RANGE_SCHEMA = {
+    "type": "array",
+    "items": {"type": "integer"},
+    "examples": {"default": {"summary": "Example range", "value": [0, 100]}},
+}
+OPTIONS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "lang": {
+            "type": "string",
+            "examples": {"default": {"summary": "Example language", "value": "en"}},
+        },
+    },
+}
+
+# Части спецификации, не зависящие от рынка
+SPEC_SERVERS = [
+    {
+        "url": "https://scanner.tradingview.com",
+        "description": "TradingView Scanner API",
+    }
+]
+SPEC_SECURITY = [{"apiKeyAuth": []}]
+SPEC_ERROR_RESPONSES = {
+    "400": {"description": "Bad request"},
+    "500": {"description": "Internal server error"},
+}
+SPEC_SECURITY_SCHEMES = {
+    "apiKeyAuth": {
+        "type": "apiKey",
+        "in": "header",
+        "name": "Authorization",
+        "description": "API key for authentication",
+    }
+}
+
 
 class OpenAPIGeneratorError(Exception):
     """Base class for OpenAPI generator errors."""
@@ -117,6 +222,7 @@ class OpenAPIPipeline:
         """
         # Initialize caches early to avoid AttributeError
         self._markets_cache: list[str] | None = None
+        self._markets_mtime: float | None = None
         self._display_names_cache: dict[str, str] | None = None
 
         self.data_dir = Path(data_dir)
@@ -151,6 +257,16 @@ class OpenAPIPipeline:
         # File paths for data
         self.metainfo_dir = self.data_dir / "metainfo"
 
+    async def aclose(self) -> None:
+        """Close the API client and its pooled connections."""
+        await self.api_client.aclose()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Worker processes only generate specs from local files; the HTTP client is not picklable
+        state = self.__dict__.copy()
+        state["api_client"] = None
+        return state
+
     def _setup_logging(self) -> None:
         """Configure logging for the pipeline."""
         logs_dir = Path("logs")
@@ -163,6 +279,9 @@ class OpenAPIPipeline:
             format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} - {message}",
             rotation="10 MB",
             retention="7 days",
+            # Format and write from a background worker, in 64 KiB blocks
+            enqueue=True,
+            buffering=1 << 16,
         )
 
         # Add console logger
@@ -170,52 +289,60 @@ class OpenAPIPipeline:
             sys.stderr,
             level="INFO",
             format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} - {message}",
+            enqueue=True,
         )
 
     def _load_markets(self) -> list[str]:
-        """Loads list of markets from file."""
-        if self._markets_cache is not None:
-            return self._markets_cache
-
+        """Loads list of markets from file, reparsing only when its mtime changes."""
         try:
-            with open(self.markets_file, encoding="utf-8") as f:
-                data = json.load(f)
+            mtime = os.stat(self.markets_file).st_mtime
+            if self._markets_cache is not None and mtime == self._markets_mtime:
+                return self._markets_cache
+
+            data = loads(self.markets_file.read_bytes())
             # Handle both array and object formats
             if isinstance(data, list):
                 markets = data
             else:
                 markets = data.get("countries", []) + data.get("other", [])
-            self._markets_cache = [str(market) for market in markets]
+            # Drop duplicates (e.g. a market listed in both "countries" and "other"), keep order
+            self._markets_cache = list(dict.fromkeys(sys.intern(str(market)) for market in markets))
+            self._markets_mtime = mtime
             return self._markets_cache
         except Exception as e:
             logger.error(f"Failed to load markets: {e}")
             self._markets_cache = []
+            self._markets_mtime = None
             return []
 
     def _load_display_names(self) -> dict[str, str]:
         """Load display names from JSON file."""
         try:
-            if self.display_names_file.exists():
-                with open(self.display_names_file, encoding="utf-8") as f:
-                    data = json.load(f)
-                    return data if isinstance(data, dict) else {}
-            else:
-                logger.warning(f"Display names file not found: {self.display_names_file}")
-                return {}
+            data = load_json_cached(self.display_names_file)
+            return dict(data) if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            logger.warning(f"Display names file not found: {self.display_names_file}")
+            return {}
         except Exception as e:
             logger.error(f"Error loading display names: {e}")
             return {}
 
     def _load_metainfo(self, market: str) -> dict:
-        metainfo_path = self.metainfo_dir / f"{market}.json"
-        if not metainfo_path.exists():
-            raise FileSystemError(f"Metainfo file not found: {metainfo_path}")
-        with open(metainfo_path, encoding="utf-8") as f:
-            data = json.load(f)
+        """
+        Load metainfo for a market.
+
+        The parsed file is shared through load_json_cached, so the caller gets its own
+        top-level dict and fields list; the field dicts themselves are shared and read-only.
+        """
+        metainfo_path = os.path.join(self.metainfo_dir, f"{market}.json")
+        try:
+            data = load_json_cached(metainfo_path)
+        except FileNotFoundError:
+            raise FileSystemError(f"Metainfo file not found: {metainfo_path}") from None
         if isinstance(data, list):
-            return {"fields": data}
+            return {"fields": list(data)}
         if isinstance(data, dict) and "fields" in data:
-            return data
+            return {**data, "fields": list(data["fields"])}
         raise FileSystemError(f"Unexpected metainfo format in {metainfo_path}: {type(data)}")
 
     def _map_tradingview_type_to_openapi(self, tv_type: str) -> str:
@@ -228,22 +355,7 @@ class OpenAPIPipeline:
         Returns:
             Corresponding OpenAPI type
         """
-        mapping = {
-            "number": "number",
-            "price": "number",
-            "percent": "number",
-            "integer": "integer",
-            "string": "string",
-            "text": "string",
-            "bool": "boolean",
-            "boolean": "boolean",
-            "time": "string",
-            "set": "array",
-            "map": "object",
-            "num_slice": "number",
-            "fundamental_price": "number",
-        }
-        return mapping.get(tv_type, "string")
+        return _map_tv_type(tv_type, "string")
 
     def _generate_field_example(self, field: dict[str, Any]) -> Any:
         """
@@ -293,9 +405,13 @@ class OpenAPIPipeline:
     ) -> dict[str, Any]:
         if debug_trace is None:
             debug_trace = self.debug_trace
+        # Unpack the field once; each key is read a single time below
         field_name = field.get("n", "unknown")
         tv_type = field.get("t", "string")
-        openapi_type = self._map_tradingview_type_to_openapi(tv_type)
+        description = field.get("d")
+        example = field.get("e")
+        enum_values = field.get("r")
+        openapi_type = _map_tv_type(tv_type, "string")
 
         # Initialize schema
         schema = {
@@ -303,7 +419,6 @@ class OpenAPIPipeline:
         }
 
         # Add description if available
-        description = field.get("d")
         if description and isinstance(description, str):
             # Normalize description: trim whitespace, replace newlines with spaces
             normalized_desc = " ".join(description.strip().split())
@@ -312,34 +427,22 @@ class OpenAPIPipeline:
             schema["description"] = normalized_desc
 
         # Add example if available and not disabled
-        example = field.get("e")
         if example is not None and self._validate_example_type(example, openapi_type):
-            schema.update(self._convert_example_to_examples(example, field.get("n", "field")))
+            schema.update(self._convert_example_to_examples(example, field_name))
 
         # Handle enum values
-        enum_values = field.get("r")
         if enum_values and isinstance(enum_values, list):
-            if skip_enum_validation:
-                # Unsafe mode: pass through all values as-is
-                if enum_values:
-                    if isinstance(enum_values[0], dict) and "id" in enum_values[0]:
-                        enum_list = [str(item["id"]) for item in enum_values]
-                    else:
-                        enum_list = [str(item) for item in enum_values]
-                    schema["enum"] = enum_list
+            # Unsafe mode passes values through as-is, safe mode validates them first
+            if skip_enum_validation or self._validate_enum_values(enum_values, openapi_type):
+                first = enum_values[0]
+                if isinstance(first, dict) and "id" in first:
+                    schema["enum"] = [str(item["id"]) for item in enum_values]
+                else:
+                    schema["enum"] = [str(item) for item in enum_values]
+                if skip_enum_validation:
                     logger.warning(f"[enum/unsafe] {market}:{field_name}: bypassing validation, enum may be malformed")
             else:
-                # Safe mode: validate enum values
-                if self._validate_enum_values(enum_values, openapi_type):
-                    if isinstance(enum_values[0], dict) and "id" in enum_values[0]:
-                        enum_list = [str(item["id"]) for item in enum_values]
-                    else:
-                        enum_list = [str(item) for item in enum_values]
-                    schema["enum"] = enum_list
-                else:
-                    logger.warning(
-                        f"[enum/type] {market}:{field_name}: enum values don't match field type {openapi_type}"
-                    )
+                logger.warning(f"[enum/type] {market}:{field_name}: enum values don't match field type {openapi_type}")
 
         if debug_trace:
             schema["x-tradingview-id"] = field.get("n", "")
@@ -358,19 +461,10 @@ class OpenAPIPipeline:
         Returns:
             True if example matches type, False otherwise
         """
-        if openapi_type == "string":
-            return isinstance(example, str)
-        elif openapi_type == "number":
-            return isinstance(example, (int, float)) and not isinstance(example, bool)
-        elif openapi_type == "integer":
-            return isinstance(example, int) and not isinstance(example, bool)
-        elif openapi_type == "boolean":
-            return isinstance(example, bool)
-        elif openapi_type == "array":
-            return isinstance(example, list)
-        elif openapi_type == "object":
-            return isinstance(example, dict)
-        return True  # Unknown type, accept any value
+        py_types = EXAMPLE_PY_TYPES.get(openapi_type)
+        if py_types is None:
+            return True  # Unknown type, accept any value
+        return type(example) in py_types
 
     def _validate_enum_values(self, enum_values: list[Any], openapi_type: str) -> bool:
         """
@@ -386,28 +480,21 @@ class OpenAPIPipeline:
         if not enum_values:
             return False
 
-        # Extract actual values from enum objects
-        actual_values = []
-        for item in enum_values:
-            if isinstance(item, dict) and "id" in item:
-                actual_values.append(item["id"])
-            else:
-                actual_values.append(item)
+        py_types = EXAMPLE_PY_TYPES.get(openapi_type)
+        if py_types is None:
+            return True  # Unknown type, accept any value
 
-        # Validate each value
-        for value in actual_values:
-            if not self._validate_example_type(value, openapi_type):
+        # Validate each value, unwrapping enum objects on the fly
+        for item in enum_values:
+            value = item["id"] if type(item) is dict and "id" in item else item
+            if type(value) not in py_types:
                 return False
 
         return True
 
     def _extract_fields_from_metainfo(self, metainfo: list[dict[str, Any]]) -> list[str]:
         """Extracts field names from metadata."""
-        fields = []
-        for field in metainfo:
-            if "n" in field:
-                fields.append(str(field["n"]))
-        return fields
+        return [str(field["n"]) for field in metainfo if "n" in field]
 
     def _create_openapi_fields_schema(
         self,
@@ -446,6 +533,7 @@ class OpenAPIPipeline:
         # Track statistics
         fields_with_description = 0
         fields_with_examples = 0
+        fields_without_examples = []
 
         fields = {}
         for field_name, field_info in metainfo.items():
@@ -454,11 +542,13 @@ class OpenAPIPipeline:
             )
             fields[field_name] = schema
 
-            # Track statistics
+            # Track statistics (покрытие примерами считается в том же проходе)
             if "description" in schema:
                 fields_with_description += 1
             if "examples" in schema:
                 fields_with_examples += 1
+            else:
+                fields_without_examples.append(field_name)
 
         # Log statistics
         logger.info(f"[spec] {fields_with_description} fields with descriptions")
@@ -467,17 +557,12 @@ class OpenAPIPipeline:
             logger.info(f"[spec] Examples enabled - {fields_with_examples}/{len(fields)} fields have examples")
 
         # Аудит покрытия примерами
-        fields_with_examples = [
-            name for name, schema in fields.items() if isinstance(schema, dict) and "examples" in schema
-        ]
         total_fields = len(fields)
-        num_with_examples = len(fields_with_examples)
-        fields_without_examples = [name for name in fields if name not in fields_with_examples]
         if market:
-            logger.info(f"[coverage] {market}: {num_with_examples}/{total_fields} fields have examples")
+            logger.info(f"[coverage] {market}: {fields_with_examples}/{total_fields} fields have examples")
             if fields_without_examples:
                 logger.info(f"[coverage] {market}: fields without examples: {fields_without_examples}")
-            coverage = num_with_examples / total_fields if total_fields else 1.0
+            coverage = fields_with_examples / total_fields if total_fields else 1.0
             if self.require_examples and coverage < 0.8:
                 logger.error(f"[coverage] {market}: example coverage {coverage:.0%} < 80% — spec not saved!")
                 raise ValidationError(f"Example coverage {coverage:.0%} < 80% for {market}")
@@ -549,56 +634,15 @@ class OpenAPIPipeline:
         return {
             "type": "object",
             "properties": {
-                "symbols": {
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "object",
-                            "properties": {
-                                "types": {
-                                    "type": "array",
-                                    "items": {"type": "string"},
-                                    "examples": {"default": {"summary": "Example types", "value": ["stock"]}},
-                                }
-                            },
-                        }
-                    },
-                },
+                "symbols": SYMBOLS_SCHEMA,
                 "columns": {
                     "type": "array",
                     "items": {"type": "string"},
                     "examples": {"default": {"summary": "Example columns", "value": list(fields.keys())[:5]}},
                 },
-                "filters": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "description": "Filter object with various criteria",
-                        "properties": {
-                            "field": {"type": "string", "description": "Field name to filter by"},
-                            "value": {"type": "string", "description": "Filter value"},
-                            "operator": {
-                                "type": "string",
-                                "enum": [">", "<", ">=", "<=", "=", "!="],
-                                "description": "Comparison operator",
-                            },
-                        },
-                    },
-                },
-                "range": {
-                    "type": "array",
-                    "items": {"type": "integer"},
-                    "examples": {"default": {"summary": "Example range", "value": [0, 100]}},
-                },
-                "options": {
-                    "type": "object",
-                    "properties": {
-                        "lang": {
-                            "type": "string",
-                            "examples": {"default": {"summary": "Example language", "value": "en"}},
-                        },
-                    },
-                },
+                "filters": FILTERS_SCHEMA,
+                "range": RANGE_SCHEMA,
+                "options": OPTIONS_SCHEMA,
             },
             "required": ["symbols", "columns"],
         }
@@ -675,19 +719,7 @@ class OpenAPIPipeline:
                 "type": "object",
                 "properties": fields,
             },
-            "Filter": {
-                "type": "object",
-                "description": "Filter object with various criteria",
-                "properties": {
-                    "field": {"type": "string", "description": "Field name to filter by"},
-                    "value": {"type": "string", "description": "Filter value"},
-                    "operator": {
-                        "type": "string",
-                        "enum": [">", "<", ">=", "<=", "=", "!="],
-                        "description": "Comparison operator",
-                    },
-                },
-            },
+            "Filter": FILTER_SCHEMA,
             "RequestBody": self._generate_request_body_schema(fields, filter_schemas),
             "FilterExpression": self._generate_filter_expression_schema(metainfo, skip_enum_validation),
         }
@@ -747,16 +779,16 @@ class OpenAPIPipeline:
         if not metainfo:
             raise ValueError(f"No metainfo found for market: {market}")
 
-        # Convert metainfo to dictionary format for easier processing
-        metainfo_dict = {}
-        for field in metainfo["fields"]:
-            if "n" in field:
-                metainfo_dict[field["n"]] = field
-
-        # Filter fields if verification is enabled
+        # Convert metainfo to dictionary format for easier processing,
+        # filtering by verified fields in the same pass if verification is enabled
         if verified_fields:
-            metainfo_dict = {k: v for k, v in metainfo_dict.items() if k in verified_fields}
+            verified = frozenset(verified_fields)
+            metainfo_dict = {
+                field["n"]: field for field in metainfo["fields"] if "n" in field and field["n"] in verified
+            }
             logger.info(f"[spec] Using {len(metainfo_dict)} verified fields for {market}")
+        else:
+            metainfo_dict = {field["n"]: field for field in metainfo["fields"] if "n" in field}
 
         # Generate schemas
         fields = self._generate_field_schemas(metainfo_dict, skip_enum_validation, no_examples, market)
@@ -830,13 +862,8 @@ This API provides access to real-time {display_name} market data from TradingVie
 Get list of tickers with RSI > 70 via POST /scan with appropriate filters.""",
                 "version": "1.0.0",
             },
-            "servers": [
-                {
-                    "url": "https://scanner.tradingview.com",
-                    "description": "TradingView Scanner API",
-                }
-            ],
-            "security": [{"apiKeyAuth": []}],
+            "servers": SPEC_SERVERS,
+            "security": SPEC_SECURITY,
             "paths": {
                 "/scan": {
                     "post": {
@@ -855,8 +882,7 @@ Get list of tickers with RSI > 70 via POST /scan with appropriate filters.""",
                                     }
                                 },
                             },
-                            "400": {"description": "Bad request"},
-                            "500": {"description": "Internal server error"},
+                            **SPEC_ERROR_RESPONSES,
                         },
                     }
                 }
@@ -865,14 +891,7 @@ Get list of tickers with RSI > 70 via POST /scan with appropriate filters.""",
                 "schemas": self._generate_components_schemas(
                     fields, filter_schemas, metainfo_dict, skip_enum_validation
                 ),
-                "securitySchemes": {
-                    "apiKeyAuth": {
-                        "type": "apiKey",
-                        "in": "header",
-                        "name": "Authorization",
-                        "description": "API key for authentication",
-                    }
-                },
+                "securitySchemes": SPEC_SECURITY_SCHEMES,
             },
         }
         if components_examples:
@@ -884,13 +903,12 @@ Get list of tickers with RSI > 70 via POST /scan with appropriate filters.""",
         if operation_id:
             spec["paths"]["/scan"]["post"]["operationId"] = operation_id
 
-        # Аудит покрытия примерами
-        fields_with_examples = [
-            name for name, schema in fields.items() if isinstance(schema, dict) and "examples" in schema
+        # Аудит покрытия примерами: один проход делит поля на с примерами и без
+        fields_without_examples = [
+            name for name, schema in fields.items() if not (isinstance(schema, dict) and "examples" in schema)
         ]
         total_fields = len(fields)
-        num_with_examples = len(fields_with_examples)
-        fields_without_examples = [name for name in fields if name not in fields_with_examples]
+        num_with_examples = total_fields - len(fields_without_examples)
         logger.info(f"[coverage] {market}: {num_with_examples}/{total_fields} fields have examples")
         if fields_without_examples:
             logger.info(f"[coverage] {market}: fields without examples: {fields_without_examples}")
@@ -921,52 +939,86 @@ Get list of tickers with RSI > 70 via POST /scan with appropriate filters.""",
         display_name = self.display_names.get(market, market.title())
         return f"Scan {display_name} market with filters and technical indicators"
 
-    def _replace_examples_recursive(self, obj):
-        """Рекурсивно заменяет все example на examples."""
+    def _replace_examples_recursive(self, obj, index: dict[int, bool] | None = None):
+        """
+        Рекурсивно заменяет все example на examples.
+
+        index - результат index_key(obj, "example", index): поддеревья без example
+        возвращаются как есть, без копирования.
+        """
+        if index is not None and not index.get(id(obj), True):
+            return obj
         if isinstance(obj, dict):
             result = {}
             for key, value in obj.items():
                 if key == "example":
-                    # Заменяем example на examples
-                    result["examples"] = self._convert_example_to_examples(value)
+                    # Заменяем example на examples, вычищая example внутри самого значения
+                    result["examples"] = self._convert_example_to_examples(remove_all_examples(value))
                 else:
-                    result[key] = self._replace_examples_recursive(value)
+                    result[key] = self._replace_examples_recursive(value, index)
             return result
         elif isinstance(obj, list):
-            return [self._replace_examples_recursive(item) for item in obj]
+            return [self._replace_examples_recursive(item, index) for item in obj]
         return obj
 
     def save_spec(self, market: str, spec: dict[str, Any]) -> None:
         """
         Saves specification to file.
         """
-        # Рекурсивно заменяем все example на examples
-        spec = self._replace_examples_recursive(spec)
-        # Финальная очистка: удаляем все оставшиеся example (глобальная функция)
-        spec = remove_all_examples(spec)
-        spec_file = self.specs_dir / f"{market}_openapi.json"
-        with open(spec_file, "w", encoding="utf-8") as f:
-            json.dump(spec, f, indent=2, ensure_ascii=False)
+        # Один проход индексирует, в каких поддеревьях есть ключи example;
+        # копируются только они: example заменяются на examples, вложенные example удаляются.
+        index: dict[int, bool] = {}
+        if index_key(spec, "example", index):
+            spec = self._replace_examples_recursive(spec, index)
+        spec_file = os.path.join(self.specs_dir, f"{market}_openapi.json")
+        write_json(spec_file, spec, indent=True)
         logger.info(f"Saved spec for {market}: {spec_file}")
 
-    async def run(self) -> OpenAPIGeneratorResult:
+    async def run(self, workers: int = 1) -> OpenAPIGeneratorResult:
         """
         Run the pipeline to generate all specifications.
+
+        Args:
+            workers: Number of worker processes; generation is CPU-bound, so markets are
+                spread over a process pool when workers > 1 (serial on Windows)
         """
         results = {}
         errors = []
 
+        # Check metainfo presence for all markets with one directory listing
+        try:
+            with os.scandir(self.metainfo_dir) as entries:
+                available = {entry.name: entry for entry in entries}
+        except FileNotFoundError:
+            available = {}
+
+        markets = []
+        missing = []
         for market in self.markets:
-            try:
-                logger.info(f"Generating spec for {market}")
-                spec = self.generate_openapi_spec(market)
-                self.save_spec(market, spec)
-                results[market] = {"status": "success", "spec": spec}
-            except Exception as e:
-                logger.error(f"Error generating spec for {market}: {e}")
-                errors.append(f"{market}: {str(e)}")
-                results[market] = {"status": "error", "error": str(e)}
+            (markets if f"{market}.json" in available else missing).append(market)
+
+        if missing:
+            logger.error(f"Metainfo not found in {self.metainfo_dir} for {len(missing)} markets: {', '.join(missing)}")
+            for market in missing:
+                error = f"Metainfo file not found: {self.metainfo_dir / f'{market}.json'}"
+                errors.append(f"{market}: {error}")
+                results[market] = {"status": "error", "error": error}
+
+        if workers > 1 and len(markets) > 1 and os.name != "nt":
+            sizes = {market: _entry_size(available[f"{market}.json"]) for market in markets}
+            outcomes = await self._generate_in_processes(markets, workers, sizes)
+        else:
+            outcomes = map(self._generate_market, markets)
+
+        for market, outcome in zip(markets, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error generating spec for {market}: {outcome}")
+                errors.append(f"{market}: {str(outcome)}")
+                results[market] = {"status": "error", "error": str(outcome)}
+            else:
+                results[market] = {"status": "success", "spec": outcome}
 
+        logger.info(f"Generated {len(self.markets) - len(errors)}/{len(self.markets)} specs, {len(errors)} failed")
         return OpenAPIGeneratorResult(
             results=results,
             errors=errors,
@@ -975,6 +1027,91 @@ Get list of tickers with RSI > 70 via POST /scan with appropriate filters.""",
             failed=len(errors),
         )
 
+    def _generate_market(self, market: str) -> dict[str, Any] | Exception:
+        """Generate and save the spec for one market; the error is returned instead of raised."""
+        try:
+            logger.debug("Generating spec for {}", market)
+            spec = self.generate_openapi_spec(market)
+            self.save_spec(market, spec)
+            return spec
+        except Exception as e:
+            return e
+
+    async def _generate_in_processes(
+        self, markets: list[str], workers: int, sizes: dict[str, int]
+    ) -> list[dict[str, Any] | Exception]:
+        """Generate specs in a process pool, returning outcomes in markets order."""
+        # Самые большие metainfo запускаются первыми, чтобы не оставлять их в хвосте
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(markets)), initializer=_init_spec_worker, initargs=(self,)
+        ) as pool:
+            order = sorted(markets, key=sizes.__getitem__, reverse=True)
+            outcomes = await asyncio.gather(
+                *(loop.run_in_executor(pool, _generate_spec_in_worker, market) for market in order),
+                return_exceptions=True,
+            )
+        by_market = dict(zip(order, outcomes))
+        return [by_market[market] for market in markets]
+
+
+def _entry_size(entry: os.DirEntry) -> int:
+    """Size of a scandir entry; a file removed since the listing counts as 0, its error surfaces in generation."""
+    try:
+        return entry.stat().st_size
+    except OSError:
+        return 0
+
+
+# Пайплайн рабочего процесса: передается один раз через initializer пула, а не с каждой задачей
+_worker_pipeline: OpenAPIPipeline | None = None
+
+
+def _init_spec_worker(pipeline: OpenAPIPipeline) -> None:
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+
+
+def _generate_spec_in_worker(market: str) -> dict[str, Any] | Exception:
+    return _worker_pipeline._generate_market(market)
+
+
+def index_key(obj: Any, key: str, index: dict[int, bool]) -> bool:
+    """
+    Mark every dict/list nested in obj with whether its subtree contains the given key.
+
+    Flags are computed bottom-up and stored in index by id(), so shared subtrees are visited once
+    and later lookups for any node are a single dict access. Returns the flag for obj itself.
+    """
+    # Явный стек вместо рекурсии: узел кладется повторно с done=True и
+    # получает флаг после всех своих потомков. Скаляры в стек не попадают.
+    stack = [(obj, False)]
+    while stack:
+        node, done = stack.pop()
+        node_type = type(node)
+        if node_type is not dict and node_type is not list:
+            continue
+        if done:
+            found = node_type is dict and key in node
+            if not found:
+                for value in node.values() if node_type is dict else node:
+                    if index.get(id(value)):
+                        found = True
+                        break
+            index[id(node)] = found
+            continue
+        node_id = id(node)
+        if node_id in index:
+            continue
+        index[node_id] = False
+        stack.append((node, True))
+        stack.extend(
+            (value, False)
+            for value in (node.values() if node_type is dict else node)
+            if type(value) is dict or type(value) is list
+        )
+    return index.get(id(obj), False)
+
 
 def remove_all_examples(obj):
     if isinstance(obj, dict):
@@ -992,7 +1129,22 @@ Pipeline = OpenAPIPipeline
 async def main() -> None:
     """Main entry point."""
     pipeline = OpenAPIPipeline()
-    await pipeline.run()
+    try:
+        await pipeline.run(workers=settings.generation_workers)
+    finally:
+        await pipeline.aclose()
+
+
+def run_async(coro):
+    """Run a coroutine to completion, on uvloop when it is installed."""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
+def cli_entry() -> None:
+    """Console script entry point."""
+    run_async(main())
 
 
 def generate_all_specifications(
@@ -1008,6 +1160,7 @@ def generate_all_specifications(
     include_examples: bool = False,
     require_examples: bool = False,
     debug_trace: bool = False,
+    workers: int | None = None,
 ) -> OpenAPIGeneratorResult:
     """
     Generate all OpenAPI specifications.
@@ -1025,6 +1178,7 @@ def generate_all_specifications(
         include_examples: Include real scan examples in OpenAPI components.examples
         require_examples: Require example coverage to be at least 80%
         debug_trace: Enable debug trace for logging
+        workers: Number of worker processes for spec generation (default: settings.generation_workers)
 
     Returns:
         OpenAPIGeneratorResult with results
@@ -1039,7 +1193,14 @@ def generate_all_specifications(
         require_examples=require_examples,
         debug_trace=debug_trace,
     )
-    return asyncio.run(pipeline.run())
+
+    async def _run() -> OpenAPIGeneratorResult:
+        try:
+            return await pipeline.run(workers=settings.generation_workers if workers is None else workers)
+        finally:
+            await pipeline.aclose()
+
+    return run_async(_run())
 
 
 class OpenAPIExampleGenerator:
@@ -2,13 +2,19 @@
 Sync module for tv-screener data.
 """
 
-import json
 import logging
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .json_io import dumps, loads, write_json
 
 logger = logging.getLogger("tv_generator.sync")
 
@@ -29,6 +35,64 @@ MARKETS = ["stock", "forex", "crypto", "futures", "cfd", "bonds", "etf", "index"
 # Only use real endpoints: /metainfo and /scan
 TV_BASE = "https://scanner.tradingview.com"
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Тело запроса /scan для sync_scan; меняется только markets
+SCAN_PAYLOAD_TEMPLATE = {
+    "filter": [],
+    "options": {"lang": "en"},
+    "markets": [],
+    "symbols": {"query": {"types": []}, "tickers": []},
+    "columns": ["name", "close", "volume"],
+    "sort": {"sortBy": "close", "sortOrder": "desc"},
+    "range": [0, 50],
+}
+
+# tv-screener modules that are not copied as market data
+SKIP_SOURCE_FILES = frozenset({"__init__.py", "column.py"})
+
+
+@lru_cache(maxsize=1)
+def _get_session() -> requests.Session:
+    """Shared keep-alive session, with a pool large enough for the sync_display_names threads."""
+    retry = Retry(
+        total=5,
+        connect=3,
+        read=3,
+        status=5,
+        backoff_factor=0.5,
+        backoff_max=30,
+        backoff_jitter=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _copy_file(src: Path, dst: Path) -> None:
+    """Copy file in kernel space via copy_file_range, falling back to shutil.copy2."""
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
 
 def sync_tv_screener_data(source_dir: Path, force: bool = False) -> None:
     """Sync data from tv-screener project."""
@@ -41,109 +105,112 @@ def sync_tv_screener_data(source_dir: Path, force: bool = False) -> None:
 
     if src_file.exists():
         dst_file.parent.mkdir(exist_ok=True)
-        shutil.copy2(src_file, dst_file)
-        logger.info(f"Copied {src_file}")
+        _copy_file(src_file, dst_file)
+        logger.info("Copied %s", src_file)
     else:
-        logger.warning(f"Source file not found: {src_file}")
+        logger.warning("Source file not found: %s", src_file)
 
     # Copy market data
     src_dir = source_dir / "src" / "tradingview_screener"
     dst_dir = Path("data")
 
+    # One directory listing instead of an exists() call per source file
+    try:
+        with os.scandir(dst_dir) as entries:
+            existing = {entry.name for entry in entries}
+    except FileNotFoundError:
+        existing = set()
+
     for src_file in src_dir.glob("*.py"):
-        if src_file.name in ["__init__.py", "column.py"]:
+        if src_file.name in SKIP_SOURCE_FILES:
             continue
 
-        dst_file = dst_dir / src_file.name
-        if not dst_file.exists() or force:
+        if src_file.name not in existing or force:
             dst_dir.mkdir(exist_ok=True)
-            shutil.copy2(src_file, dst_file)
-            logger.info(f"Copied {src_file.name}")
+            _copy_file(src_file, dst_dir / src_file.name)
+            logger.info("Copied %s", src_file.name)
 
 
 def sync_markets() -> None:
     """Save the list of real TradingView markets to data/markets.json."""
     out_path = DATA_DIR / "markets.json"
-    logger.info(f"Saving static TradingView markets list to {out_path}")
+    logger.info("Saving static TradingView markets list to %s", out_path)
     out_path.parent.mkdir(exist_ok=True)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(MARKETS, f, ensure_ascii=False, indent=2)
-    logger.info(f"Saved markets to {out_path.resolve()}")
+    write_json(out_path, MARKETS, indent=True)
+    logger.info("Saved markets to %s", out_path.resolve())
 
 
-def sync_display_names() -> None:
-    """Fetch and save TradingView field/column names for each market from /metainfo endpoint only."""
+def _fetch_display_names(market: str) -> list[str] | None:
+    """Fetch field/column names of one market from /metainfo, None on failure."""
+    url = f"{TV_BASE}/{market}/metainfo"
+    logger.info("Fetching display names for %s from %s", market, url)
+    try:
+        resp = _get_session().get(url, timeout=20)
+        logger.info("%s -> %s", url, resp.status_code)
+        if resp.status_code != 200:
+            logger.error("Failed to fetch metainfo for %s: status %s", market, resp.status_code)
+            return None
+        data = loads(resp.content)
+        # Extract all field/column/filter names from metainfo
+        fields = list(data.get("fields", {}).keys())
+        logger.info("%s: %s fields", market, len(fields))
+        return fields
+    except Exception as e:
+        logger.error("Exception fetching metainfo for %s: %s", market, e)
+        return None
+
+
+def sync_display_names(max_workers: int = 8) -> None:
+    """Fetch and save TradingView field/column names for each market from /metainfo endpoint only.
+
+    Markets are fetched concurrently over the shared session; the output keeps MARKETS order.
+    """
     out_path = DATA_DIR / "column_display_names.json"
-    out = {}
-    for market in MARKETS:
-        url = f"{TV_BASE}/{market}/metainfo"
-        logger.info(f"Fetching display names for {market} from {url}")
-        try:
-            resp = requests.get(url, timeout=20)
-            logger.info(f"{url} -> {resp.status_code}")
-            if resp.status_code != 200:
-                logger.error(f"Failed to fetch metainfo for {market}: status {resp.status_code}")
-                continue
-            data = resp.json()
-            # Extract all field/column/filter names from metainfo
-            fields = list(data.get("fields", {}).keys())
-            out[market] = fields
-            logger.info(f"{market}: {len(fields)} fields")
-        except Exception as e:
-            logger.error(f"Exception fetching metainfo for {market}: {e}")
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tv-sync") as pool:
+        results = pool.map(_fetch_display_names, MARKETS)
+        out = {market: fields for market, fields in zip(MARKETS, results) if fields is not None}
     out_path.parent.mkdir(exist_ok=True)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(out, f, ensure_ascii=False, indent=2)
-    logger.info(f"Saved column display names to {out_path.resolve()}")
+    write_json(out_path, out, indent=True)
+    logger.info("Saved column display names to %s", out_path.resolve())
 
 
 def sync_metainfo(market: str) -> None:
     """Fetch and save metainfo for a specific market from TradingView /metainfo endpoint only."""
     url = f"{TV_BASE}/{market}/metainfo"
     out_path = METAINFO_DIR / f"{market}.json"
-    logger.info(f"Fetching metainfo for {market} from {url}")
+    logger.info("Fetching metainfo for %s from %s", market, url)
     try:
-        resp = requests.get(url, timeout=20)
-        logger.info(f"{url} -> {resp.status_code}")
+        resp = _get_session().get(url, timeout=20)
+        logger.info("%s -> %s", url, resp.status_code)
         if resp.status_code != 200:
-            logger.error(f"Failed to fetch metainfo for {market}: status {resp.status_code}")
+            logger.error("Failed to fetch metainfo for %s: status %s", market, resp.status_code)
             return
-        data = resp.json()
+        data = loads(resp.content)
         # Если data - список, оборачиваем в {'fields': ...}
         if isinstance(data, list):
             data = {"fields": data}
         out_path.parent.mkdir(exist_ok=True)
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        logger.info(f"Saved metainfo for {market} to {out_path.resolve()}")
+        write_json(out_path, data, indent=True)
+        logger.info("Saved metainfo for %s to %s", market, out_path.resolve())
     except Exception as e:
-        logger.error(f"Exception fetching metainfo for {market}: {e}")
+        logger.error("Exception fetching metainfo for %s: %s", market, e)
 
 
 def sync_scan(market: str) -> None:
     """Fetch and save scan data for a specific market from TradingView /scan endpoint only."""
     url = f"{TV_BASE}/{market}/scan"
     out_path = SCAN_DIR / f"{market}.json"
-    logger.info(f"Fetching scan data for {market} from {url}")
-    payload = {
-        "filter": [],
-        "options": {"lang": "en"},
-        "markets": [market],
-        "symbols": {"query": {"types": []}, "tickers": []},
-        "columns": ["name", "close", "volume"],
-        "sort": {"sortBy": "close", "sortOrder": "desc"},
-        "range": [0, 50],
-    }
+    logger.info("Fetching scan data for %s from %s", market, url)
+    payload = {**SCAN_PAYLOAD_TEMPLATE, "markets": [market]}
     try:
-        resp = requests.post(url, json=payload, timeout=30)
-        logger.info(f"{url} -> {resp.status_code}")
+        resp = _get_session().post(url, data=dumps(payload), headers=JSON_HEADERS, timeout=30)
+        logger.info("%s -> %s", url, resp.status_code)
         if resp.status_code != 200:
-            logger.error(f"Failed to fetch scan data for {market}: status {resp.status_code}")
+            logger.error("Failed to fetch scan data for %s: status %s", market, resp.status_code)
             return
-        data = resp.json()
+        data = loads(resp.content)
         out_path.parent.mkdir(exist_ok=True)
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        logger.info(f"Saved scan data for {market} to {out_path.resolve()}")
+        write_json(out_path, data, indent=True)
+        logger.info("Saved scan data for %s to %s", market, out_path.resolve())
     except Exception as e:
-        logger.error(f"Exception fetching scan data for {market}: {e}")
+        logger.error("Exception fetching scan data for %s: %s", market, e)
@@ -2,21 +2,40 @@
 Validation module for OpenAPI specifications.
 """
 
-import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Tuple
 
 from loguru import logger
-from openapi_spec_validator import validate_spec
+
+from .json_io import loads
+
+SPEC_SUFFIX = "_openapi.json"
+
+
+# openapi_spec_validator и jsonschema импортируются при первой проверке:
+# их загрузка занимает сотни миллисекунд и не нужна при простом импорте модуля
+@lru_cache(maxsize=None)
+def _metaschema_validator(version: str):
+    """JSON Schema validator for the OpenAPI metaschema, built once per version."""
+    from jsonschema.validators import validator_for
+    from openapi_spec_validator.schemas import schema_v30, schema_v31
+
+    schema = {"3.0": schema_v30, "3.1": schema_v31}[version]
+    return validator_for(schema)(schema)
 
 
 def validate_spec_file(spec_path: Path) -> tuple[bool, list[str]]:
     """Валидирует один файл OpenAPI спецификации."""
+    from openapi_spec_validator import validate_spec
+
     errors = []
 
     try:
-        with open(spec_path, encoding="utf-8") as f:
-            spec = json.load(f)
+        with open(spec_path, "rb") as f:
+            spec = loads(f.read())
 
         # Валидация через openapi_spec_validator
         validate_spec(spec)
@@ -27,7 +46,31 @@ def validate_spec_file(spec_path: Path) -> tuple[bool, list[str]]:
         return False, errors
 
 
-def validate_all_specs(specs_dir: Path) -> None:
+def _check_spec(raw: bytes) -> str | None:
+    """Check one spec document against the OpenAPI metaschema; returns an error message or None."""
+    try:
+        spec = loads(raw)
+
+        version = spec.get("openapi") if isinstance(spec, dict) else None
+        if not isinstance(version, str):
+            raise ValueError("Missing openapi version")
+        # Метасхемы есть только для 3.0.x и 3.1.x; "2.0" или "3.2.0" не подменяются проверкой по 3.1
+        major_minor = ".".join(version.split(".")[:2])
+        if major_minor not in ("3.0", "3.1"):
+            raise ValueError(f"Unsupported openapi version: {version}")
+        validator = _metaschema_validator(major_minor)
+
+        error = next(validator.iter_errors(spec), None)
+        if error is not None:
+            location = "/".join(str(part) for part in error.absolute_path)
+            raise ValueError(f"{location}: {error.message}" if location else error.message)
+        return None
+
+    except Exception as e:
+        return str(e)
+
+
+def validate_all_specs(specs_dir: Path, max_workers: int | None = None) -> None:
     """Validate all OpenAPI specifications in the given directory."""
     if not specs_dir.exists():
         logger.error(f"Specs directory not found: {specs_dir}")
@@ -38,25 +81,40 @@ def validate_all_specs(specs_dir: Path) -> None:
     valid_count = 0
     invalid_count = 0
 
-    for spec_file in specs_dir.glob("*_openapi.json"):
-        market = spec_file.stem.replace("_openapi", "")
-        try:
-            with open(spec_file, encoding="utf-8") as f:
-                spec = json.load(f)
-
-            # Basic validation
-            if "openapi" not in spec:
-                raise ValueError("Missing openapi version")
-            if "info" not in spec:
-                raise ValueError("Missing info section")
-            if "paths" not in spec:
-                raise ValueError("Missing paths section")
-
+    # One directory pass reads every spec; workers only parse and validate bytes
+    markets = []
+    contents = []
+    read_errors = {}
+    with os.scandir(specs_dir) as entries:
+        for entry in entries:
+            if not (entry.name.endswith(SPEC_SUFFIX) and entry.is_file()):
+                continue
+            market = entry.name[: -len(SPEC_SUFFIX)]
+            try:
+                with open(entry.path, "rb") as f:
+                    contents.append(f.read())
+                markets.append(market)
+            except OSError as e:
+                read_errors[market] = str(e)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(contents)))
+
+    if max_workers > 1:
+        # JSON parsing is CPU-bound, so documents are checked in worker processes
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            errors = list(pool.map(_check_spec, contents, chunksize=4))
+    else:
+        errors = [_check_spec(raw) for raw in contents]
+
+    # Results are logged by the parent process
+    for market, error in [*zip(markets, errors), *read_errors.items()]:
+        if error is None:
             logger.info(f"{market}: Valid")
             valid_count += 1
-
-        except Exception as e:
-            logger.error(f"{market}: Invalid - {e}")
+        else:
+            logger.error(f"{market}: Invalid - {error}")
             invalid_count += 1
 
     logger.info(f"Validation Summary: {valid_count} valid, {invalid_count} invalid")
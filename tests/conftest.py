@@ -123,6 +123,8 @@ def pytest_configure(config) -> None:
     # Отключаем предупреждения о моках
     config.addinivalue_line("filterwarnings", "ignore::DeprecationWarning:unittest.mock.*")
     config.addinivalue_line("filterwarnings", "ignore::UserWarning:pytest_mock.*")
+    config.addinivalue_line("markers", "real_api: тест обращается к реальному TradingView API (запуск с --real-api)")
+    config.addinivalue_line("markers", "slow: медленный тест (пропускается с --skip-slow)")
 
 
 def pytest_unconfigure(config) -> None:
@@ -5,12 +5,14 @@
 import asyncio
 import json
 import ssl
+from collections import deque
 from pathlib import Path
 
 import httpx
 import pytest
 from loguru import logger
 
+from tv_generator import api as api_module
 from tv_generator.api import (
     APIResponse,
     NetworkError,
@@ -24,6 +26,7 @@ from tv_generator.api import (
     validate_url,
 )
 from tv_generator.config import settings
+from tv_generator.core.cache import DiskCache
 
 
 class TestRateLimiter:
@@ -63,7 +66,7 @@ class TestRateLimiter:
         assert limiter.burst_limit == 10
         assert limiter.window_size == 60.0
         assert limiter.min_interval == 0.2
-        assert isinstance(limiter.request_times, list)
+        assert isinstance(limiter.request_times, deque)
         assert len(limiter.request_times) == 0
 
 
@@ -343,6 +346,227 @@ class TestTradingViewAPI:
             await api.get_field_data("america", "INVALID_SYMBOL_12345", ["name"])
         assert "404" in str(excinfo.value) or "Not Found" in str(excinfo.value)
 
+    @pytest.fixture
+    def mock_api(self):
+        """Фабрика API клиента, отвечающего через httpx.MockTransport с переданным обработчиком."""
+
+        async def make(handler, cache=None) -> TradingViewAPI:
+            api = TradingViewAPI(cache=cache)
+            api.rate_limiter = RateLimiter(1000, burst_limit=100)
+            await api.client.aclose()
+            api.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            return api
+
+        return make
+
+    @pytest.mark.asyncio
+    async def test_parses_response_bytes(self, mock_api) -> None:
+        """Тело ответа разбирается из байтов, не-ASCII символы сохраняются."""
+        body = json.dumps({"fields": [{"n": "close", "d": "Цена"}]}, ensure_ascii=False).encode("utf-8")
+
+        def handler(request):
+            return httpx.Response(200, content=body, headers={"content-type": "application/json"})
+
+        async with await mock_api(handler) as api:
+            assert await api.get_metainfo("russia") == {"fields": [{"n": "close", "d": "Цена"}]}
+
+    @pytest.mark.asyncio
+    async def test_metainfo_uses_cache(self, mock_api, tmp_path) -> None:
+        """С переданным кэшем metainfo запрашивается по сети только один раз."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(200, json={"fields": [{"n": "close"}]}, headers={"content-type": "application/json"})
+
+        async with await mock_api(handler, cache=DiskCache(cache_dir=tmp_path / "cache")) as api:
+            first = await api.get_metainfo("crypto")
+            second = await api.get_metainfo("crypto")
+
+        assert first == second == {"fields": [{"n": "close"}]}
+        assert calls == ["/crypto/metainfo"]
+
+    @pytest.mark.asyncio
+    async def test_metainfo_conditional_get(self, mock_api, tmp_path) -> None:
+        """После истечения свежей копии metainfo переспрашивается с If-None-Match, 304 отдает сохраненное тело."""
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304, headers={"etag": '"v1"'})
+            return httpx.Response(
+                200, json={"fields": [{"n": "close"}]}, headers={"content-type": "application/json", "etag": '"v1"'}
+            )
+
+        cache = DiskCache(cache_dir=tmp_path / "cache")
+        async with await mock_api(handler, cache=cache) as api:
+            first = await api.get_metainfo("crypto")
+            await cache.delete("metainfo_crypto")
+            second = await api.get_metainfo("crypto")
+            third = await api.get_metainfo("crypto")
+
+        assert first == second == third == {"fields": [{"n": "close"}]}
+        assert seen == [None, '"v1"']
+
+    @pytest.mark.asyncio
+    async def test_metainfo_304_without_stored_copy(self, mock_api, tmp_path) -> None:
+        """Без сохраненной копии условные заголовки не уходят, а 304 - ошибка, None не кэшируется."""
+        seen = []
+
+        def handler(request):
+            seen.append((request.headers.get("if-none-match"), request.headers.get("if-modified-since")))
+            return httpx.Response(304, headers={"etag": '"v1"'})
+
+        cache = DiskCache(cache_dir=tmp_path / "cache")
+        async with await mock_api(handler, cache=cache) as api:
+            with pytest.raises(TradingViewAPIError, match="No metainfo body"):
+                await api.get_metainfo("crypto")
+
+        assert seen == [(None, None)]
+        assert await cache.get("metainfo_crypto") is None
+        assert not list((tmp_path / "cache").glob("*.json"))
+
+    @pytest.mark.asyncio
+    async def test_get_markets_info_concurrent(self, mock_api) -> None:
+        """get_markets_info запрашивает рынки параллельно и сохраняет порядок, ошибки не прерывают пакет."""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if request.url.path.startswith("/forex"):
+                return httpx.Response(500, headers={"content-type": "application/json"}, content=b"{}")
+            return httpx.Response(200, json={"fields": [{"n": "close"}]}, headers={"content-type": "application/json"})
+
+        async with await mock_api(handler) as api:
+            api.max_retries = 0
+            infos = await api.get_markets_info(["crypto", "forex", "america"])
+
+        assert [info["endpoint"] for info in infos] == ["crypto", "forex", "america"]
+        assert [info["available"] for info in infos] == [True, False, True]
+        assert peak > 1
+
+    @pytest.mark.asyncio
+    async def test_retries_after_429_honouring_retry_after(self, mock_api, monkeypatch) -> None:
+        """На 429 клиент ждет Retry-After и повторяет запрос."""
+        responses = [
+            httpx.Response(429, headers={"content-type": "application/json", "retry-after": "7"}, content=b"{}"),
+            httpx.Response(200, json={"fields": []}, headers={"content-type": "application/json"}),
+        ]
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+
+        async with await mock_api(lambda request: responses.pop(0)) as api:
+            monkeypatch.setattr(api_module.asyncio, "sleep", fake_sleep)
+            assert await api.get_metainfo("crypto") == {"fields": []}
+
+        assert sleeps[0] == 7.0
+
+    @pytest.mark.asyncio
+    async def test_retries_html_429_and_5xx_before_body_checks(self, mock_api, monkeypatch) -> None:
+        """429 и 5xx повторяются по статусу, даже если тело - HTML-страница прокси."""
+        html = {"content-type": "text/html; charset=utf-8"}
+        responses = [
+            httpx.Response(429, headers={**html, "retry-after": "3"}, content=b"<html>Too Many Requests</html>"),
+            httpx.Response(503, headers=html, content=b"<html>Service Unavailable</html>"),
+            httpx.Response(200, json={"fields": []}, headers={"content-type": "application/json"}),
+        ]
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+
+        async with await mock_api(lambda request: responses.pop(0)) as api:
+            monkeypatch.setattr(api_module.asyncio, "sleep", fake_sleep)
+            assert await api.get_metainfo("crypto") == {"fields": []}
+
+        assert sleeps[0] == 3.0
+        assert responses == []
+
+    @pytest.mark.asyncio
+    async def test_html_429_exhausts_retries_as_rate_limit(self, mock_api, monkeypatch) -> None:
+        """После всех повторов HTML-ответ 429 дает RateLimitError, а не ошибку Content-Type."""
+
+        async def fake_sleep(delay):
+            pass
+
+        def handler(request):
+            return httpx.Response(429, headers={"content-type": "text/html"}, content=b"<html>slow down</html>")
+
+        async with await mock_api(handler) as api:
+            monkeypatch.setattr(api_module.asyncio, "sleep", fake_sleep)
+            with pytest.raises(RateLimitError):
+                await api.get_metainfo("crypto")
+
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_stream(self, mock_api, monkeypatch) -> None:
+        """Ответ больше max_request_size отбрасывается при потоковом чтении, без Content-Length."""
+        monkeypatch.setattr(settings, "max_request_size", 1024)
+        sent = []
+
+        async def body():
+            for _ in range(64):
+                sent.append(1)
+                yield b"x" * 512
+
+        def handler(request):
+            return httpx.Response(200, content=body(), headers={"content-type": "application/json"})
+
+        async with await mock_api(handler) as api:
+            with pytest.raises(TradingViewAPIError, match="Response too large"):
+                await api.get_metainfo("crypto")
+
+        assert len(sent) < 64
+
+    @pytest.mark.asyncio
+    async def test_sends_preserialized_body(self, mock_api) -> None:
+        """Тело запроса сериализуется один раз и уходит как готовые байты."""
+        bodies = []
+
+        def handler(request):
+            bodies.append(request.content)
+            return httpx.Response(200, json={"data": []}, headers={"content-type": "application/json"})
+
+        payload = {"columns": ["close"], "options": {"lang": "ru"}, "label": "Цена"}
+        async with await mock_api(handler) as api:
+            await api._make_request("POST", "https://scanner.tradingview.com/crypto/scan", data=payload)
+
+        assert json.loads(bodies[0]) == payload
+        assert bodies[0] == json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    @pytest.mark.asyncio
+    async def test_http2_falls_back_without_h2(self, monkeypatch) -> None:
+        """Без пакета h2 клиент создаётся с HTTP/1.1 даже при включённом http2."""
+        monkeypatch.setattr(settings, "http2", True)
+        monkeypatch.setattr(api_module, "h2", None)
+
+        async with TradingViewAPI() as api:
+            assert api.client._transport._pool._http2 is False
+
+    @pytest.mark.asyncio
+    async def test_endpoint_url_validated_once(self, api, monkeypatch) -> None:
+        """URL эндпоинта строится и проверяется один раз; плохой endpoint отклоняется всегда."""
+        calls = []
+        original = api._validate_endpoint
+        monkeypatch.setattr(api, "_validate_endpoint", lambda endpoint: calls.append(endpoint) or original(endpoint))
+
+        async with api:
+            first = api._endpoint_url("crypto", "scan")
+            assert api._endpoint_url("crypto", "scan") is first
+            assert first == f"{api.base_url}/crypto/scan"
+            assert calls == ["crypto"]
+
+            for _ in range(2):
+                with pytest.raises(SecurityError):
+                    api._endpoint_url("crypto;drop", "scan")
+
 
 class TestAPIResponse:
     """Тесты для APIResponse."""
@@ -651,3 +651,402 @@ def test_load_scan_invalid_json(tmp_path):
     fm = AsyncFileManager(data_dir=tmp_path, specs_dir=tmp_path)
     result = asyncio.run(fm.load_scan_data("scan"))
     assert result == [], "Битый JSON scan должен возвращать пустой список"
+
+
+def test_disk_cache_delete_missing_key(tmp_path):
+    import asyncio
+
+    from tv_generator.core.cache import DiskCache
+
+    cache = DiskCache(cache_dir=tmp_path, ttl=60)
+    asyncio.run(cache.set("key", {"value": 1}))
+    asyncio.run(cache.delete("key"))
+    # Повторное удаление не должно падать
+    asyncio.run(cache.delete("key"))
+    assert asyncio.run(cache.get("key")) is None
+
+
+def test_sync_copy_file(tmp_path):
+    from tv_generator.sync import _copy_file
+
+    src = tmp_path / "column.py"
+    src.write_text("COLUMNS = {}\n" * 1000)
+    dst = tmp_path / "copy.py"
+    _copy_file(src, dst)
+    assert dst.read_text() == src.read_text()
+    assert dst.stat().st_mtime == src.stat().st_mtime
+
+
+def test_export_metrics_valid_json(tmp_path):
+    from tv_generator.core.metrics import GenerationMetrics, MetricsCollector
+
+    collector = MetricsCollector()
+    collector.metrics.append(GenerationMetrics("russia", 10, 0.5, 1.0, 1, True))
+    collector.metrics.append(GenerationMetrics("crypto", 5, 0.2, 1.0, 1, False, errors=["boom"]))
+    report = tmp_path / "metrics.json"
+    collector.export_metrics(str(report))
+
+    data = json.loads(report.read_text(encoding="utf-8"))
+    assert data["summary"]["total_generations"] == 2
+    assert [m["market"] for m in data["detailed_metrics"]] == ["russia", "crypto"]
+    assert data["detailed_metrics"][1]["errors"] == ["boom"]
+
+
+def test_append_metrics_jsonl(tmp_path):
+    from tv_generator.core.metrics import GenerationMetrics, MetricsCollector
+
+    history = tmp_path / "metrics.jsonl"
+    collector = MetricsCollector()
+    collector.metrics.append(GenerationMetrics("russia", 10, 0.5, 1.0, 1, True))
+    collector.append_metrics(str(history))
+    collector.metrics.append(GenerationMetrics("crypto", 5, 0.2, 1.0, 1, False, errors=["boom"]))
+    collector.append_metrics(str(history))
+    collector.append_metrics(str(history))
+
+    lines = history.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["market"] for line in lines] == ["russia", "crypto"]
+    assert json.loads(lines[1])["errors"] == ["boom"]
+
+
+def test_json_io_roundtrip():
+    from tv_generator.json_io import dumps, loads
+
+    data = {"market": "russia", "description": "Россия", "fields": [1, 2.5, None, True]}
+    raw = dumps(data)
+    assert isinstance(raw, bytes)
+    assert "Россия".encode("utf-8") in raw
+    assert loads(raw) == data
+    assert loads(dumps(data, indent=True)) == data
+
+
+def test_dynamic_limiter_resize():
+    """DynamicLimiter должен пропускать новых задач сразу после увеличения лимита"""
+    from tv_generator.core.parallel_pipeline import DynamicLimiter
+
+    async def scenario():
+        limiter = DynamicLimiter(1)
+        active = 0
+        peak = 0
+        gate = asyncio.Event()
+
+        async def worker():
+            nonlocal active, peak
+            async with limiter:
+                active += 1
+                peak = max(peak, active)
+                await gate.wait()
+                active -= 1
+
+        tasks = [asyncio.create_task(worker()) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert peak == 1
+        await limiter.set_concurrency(3)
+        await asyncio.sleep(0)
+        assert peak == 3
+        gate.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+
+
+def test_load_markets_reloads_on_mtime_change(tmp_path):
+    """_load_markets должен кэшировать список и перечитывать файл после его изменения"""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    markets_file = data_dir / "markets.json"
+    markets_file.write_text(json.dumps(["stock"]), encoding="utf-8")
+
+    pipeline = OpenAPIPipeline(data_dir=data_dir, specs_dir=tmp_path / "specs", setup_logging=False)
+    assert pipeline._load_markets() is pipeline._load_markets()
+
+    markets_file.write_text(json.dumps(["stock", "crypto"]), encoding="utf-8")
+    os.utime(markets_file, (0, 12345))
+    assert pipeline._load_markets() == ["stock", "crypto"]
+
+
+def test_load_markets_deduplicates(tmp_path):
+    """Повторяющиеся рынки должны попадать в список один раз в исходном порядке"""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "markets.json").write_text(
+        json.dumps({"countries": ["america", "uk"], "other": ["crypto", "uk"]}), encoding="utf-8"
+    )
+
+    pipeline = OpenAPIPipeline(data_dir=data_dir, specs_dir=tmp_path / "specs", setup_logging=False)
+    assert pipeline.markets == ["america", "uk", "crypto"]
+
+
+def test_json_io_write_json(tmp_path):
+    """write_json должен записывать валидный JSON с сохранением не-ASCII символов"""
+    from tv_generator.json_io import write_json
+
+    target = tmp_path / "spec.json"
+    target.write_text("stale content that is longer than the new payload" * 10, encoding="utf-8")
+    data = {"title": "Рынок", "values": [1, 2.5, None]}
+
+    write_json(target, data, indent=True)
+
+    text = target.read_text(encoding="utf-8")
+    assert "Рынок" in text
+    assert json.loads(text) == data
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_json_io_write_json_durable(tmp_path, monkeypatch):
+    """fsync выполняется только в режиме durable=True"""
+    from tv_generator import json_io
+
+    synced = []
+    monkeypatch.setattr(json_io.os, "fsync", synced.append)
+    target = tmp_path / "config.json"
+
+    json_io.write_json(target, {"a": 1})
+    assert synced == []
+    json_io.write_json(target, {"a": 2}, durable=True)
+    assert len(synced) == 1
+    assert json.loads(target.read_text(encoding="utf-8")) == {"a": 2}
+
+
+def test_sync_session_is_shared_and_pooled():
+    """Все запросы синхронизации идут через одну сессию с увеличенным пулом соединений"""
+    from tv_generator import sync
+
+    session = sync._get_session()
+    assert sync._get_session() is session
+    adapter = session.get_adapter(sync.TV_BASE)
+    assert adapter._pool_maxsize == 32
+    assert adapter.max_retries.respect_retry_after_header
+
+
+def test_sync_display_names_concurrent(tmp_path, monkeypatch):
+    """Имена колонок загружаются параллельно, порядок рынков сохраняется, ошибки пропускаются"""
+    from tv_generator import sync
+
+    monkeypatch.setattr(sync, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(sync, "MARKETS", ["stock", "forex", "crypto"])
+    monkeypatch.setattr(sync, "_fetch_display_names", lambda market: None if market == "forex" else [market])
+
+    sync.sync_display_names(max_workers=3)
+
+    data = json.loads((tmp_path / "column_display_names.json").read_text(encoding="utf-8"))
+    assert list(data.items()) == [("stock", ["stock"]), ("crypto", ["crypto"])]
+
+
+def test_json_io_load_json_cached(tmp_path):
+    """load_json_cached должен переиспользовать результат, пока файл не изменился"""
+    from tv_generator.json_io import load_json_cached
+
+    target = tmp_path / "metainfo.json"
+    target.write_text(json.dumps({"fields": [1]}), encoding="utf-8")
+
+    first = load_json_cached(target)
+    assert load_json_cached(target) is first
+
+    target.write_text(json.dumps({"fields": [1, 2]}), encoding="utf-8")
+    os.utime(target, ns=(0, 12345))
+    assert load_json_cached(target) == {"fields": [1, 2]}
+
+
+def test_index_key_finds_nested_key():
+    """index_key должен находить ключ на любой глубине и не зацикливаться на общих узлах"""
+    from tv_generator.main import index_key
+
+    shared = {"type": "string"}
+    spec = {"paths": {"/scan": {"post": {"schema": [shared, shared]}}}}
+    assert not index_key(spec, "example", {})
+
+    spec["paths"]["/scan"]["post"]["schema"].append({"items": [{"example": 1}]})
+    assert index_key(spec, "example", {})
+
+
+def test_index_key_marks_subtrees():
+    """index_key должен пометить каждое поддерево, а замена example - не копировать чистые поддеревья"""
+    from tv_generator.main import index_key
+
+    shared = {"type": "string"}
+    dirty = {"items": [{"example": 1}]}
+    spec = {"clean": [shared, shared], "dirty": dirty}
+    index = {}
+    assert index_key(spec, "example", index)
+    assert index[id(dirty)] and index[id(dirty["items"])]
+    assert not index[id(shared)] and not index[id(spec["clean"])]
+
+    pipeline = OpenAPIPipeline(setup_logging=False)
+    result = pipeline._replace_examples_recursive(spec, index)
+    assert result["clean"] is spec["clean"]
+    assert "example" not in result["dirty"]["items"][0]
+    assert "examples" in result["dirty"]["items"][0]
+
+
+def test_check_spec_rejects_unsupported_openapi_versions():
+    """Версии кроме 3.0.x/3.1.x отклоняются явно, а не проверяются по метасхеме 3.1"""
+    from tv_generator.validation import _check_spec
+
+    def check(version):
+        spec = {"openapi": version, "info": {"title": "Test API", "version": "1.0"}, "paths": {}}
+        return _check_spec(json.dumps(spec).encode("utf-8"))
+
+    assert check("3.0.3") is None
+    assert check("3.1.0") is None
+    for version in ("2.0", "3.2.0", "3.10.0", "4"):
+        assert check(version) == f"Unsupported openapi version: {version}"
+
+
+def test_validate_all_specs_reports_metaschema_error(tmp_path):
+    """validate_all_specs должен находить нарушения метасхемы OpenAPI, а не только отсутствие секций"""
+    from tv_generator import validation
+
+    specs_dir = tmp_path / "specs"
+    specs_dir.mkdir()
+    bad_spec = {"openapi": "3.1.0", "info": {"title": "Test API"}, "paths": {}}
+    (specs_dir / "bad_openapi.json").write_text(json.dumps(bad_spec))
+
+    messages = []
+    handler_id = logger.add(messages.append, level="ERROR", format="{message}")
+    try:
+        validation.validate_all_specs(specs_dir, max_workers=1)
+    finally:
+        logger.remove(handler_id)
+
+    assert any("bad: Invalid" in message and "version" in message for message in messages)
+
+
+def test_ichunks_splits_lazily():
+    """_ichunks отдает куски по мере итерации, последний кусок может быть короче"""
+    from tv_generator.core.parallel_pipeline import _ichunks
+
+    chunks = _ichunks(iter(range(7)), 3)
+    assert next(chunks) == [0, 1, 2]
+    assert list(chunks) == [[3, 4, 5], [6]]
+    assert list(_ichunks([], 3)) == []
+
+
+def test_disk_cache_purge_expired(tmp_path):
+    """purge_expired удаляет только просроченные и поврежденные записи"""
+    import time
+
+    from tv_generator.core.cache import DiskCache
+
+    cache = DiskCache(cache_dir=tmp_path / "cache", ttl=60)
+    asyncio.run(cache.set("fresh", 1))
+    asyncio.run(cache.set("stale", 2, ttl=1))
+    (tmp_path / "cache" / "broken.json").write_text("{", encoding="utf-8")
+
+    removed = asyncio.run(cache.purge_expired(now=time.time() + 10))
+
+    assert removed == 2
+    assert sorted(p.name for p in (tmp_path / "cache").iterdir()) == ["fresh.json"]
+
+
+def test_schema_generator_without_model_validation():
+    """С validate_models=False схемы строятся из сырых dict и совпадают с провалидированными"""
+    from tv_generator.core.schema_generator import SchemaGenerator
+
+    field = {"n": "close", "t": "price"}
+    metainfo = {"filters": {"exchange": {"n": "exchange", "type": "string", "required": True}}}
+
+    checked = SchemaGenerator({"validate_models": True})
+    fast = SchemaGenerator({"validate_models": False})
+
+    assert fast.generate_field_schema(field) == checked.generate_field_schema(field)
+    assert fast.generate_filter_schema(metainfo) == checked.generate_filter_schema(metainfo)
+    assert fast.generate_filter_schema(metainfo)["required"] == ["exchange"]
+
+
+def test_pipeline_run_in_process_pool(tmp_path):
+    """run(workers=2) генерирует те же спецификации, что и последовательный запуск"""
+    data_dir = tmp_path / "data"
+    (data_dir / "metainfo").mkdir(parents=True)
+    (data_dir / "markets.json").write_text(json.dumps(["russia", "america", "missing"]), encoding="utf-8")
+    source = Path(__file__).parent.parent / "data" / "metainfo" / "russia.json"
+    for market in ("russia", "america"):
+        shutil.copy(source, data_dir / "metainfo" / f"{market}.json")
+
+    def run(workers, specs_dir):
+        pipeline = OpenAPIPipeline(data_dir=data_dir, specs_dir=specs_dir, setup_logging=False)
+        result = asyncio.run(pipeline.run(workers=workers))
+        return result.errors, {f.name: f.read_bytes() for f in specs_dir.iterdir()}
+
+    serial = run(1, tmp_path / "serial")
+    pooled = run(2, tmp_path / "pooled")
+    assert pooled == serial
+    assert sorted(serial[1]) == ["america_openapi.json", "russia_openapi.json"]
+    assert [error.split(":")[0] for error in serial[0]] == ["missing"]
+
+
+def test_validate_models_off_by_default(monkeypatch):
+    """По умолчанию генерация не строит pydantic-модели; VALIDATE_MODELS=1 включает проверку"""
+    from tv_generator.core.schema_generator import SchemaGenerator
+
+    monkeypatch.delenv("VALIDATE_MODELS", raising=False)
+    assert Settings(_env_file=None).validate_models is False
+    assert SchemaGenerator().validate_models is settings.validate_models is False
+
+    monkeypatch.setenv("VALIDATE_MODELS", "1")
+    assert Settings(_env_file=None).validate_models is True
+    monkeypatch.setattr(settings, "validate_models", True)
+    assert SchemaGenerator().validate_models is True
+
+
+def test_main_uses_generation_workers_setting(monkeypatch):
+    """Консольная точка входа передает в run() число процессов из настроек"""
+    from tv_generator import main as main_module
+
+    seen = []
+
+    async def fake_run(self, workers=1):
+        seen.append(workers)
+
+    async def fake_aclose(self):
+        pass
+
+    monkeypatch.setattr(settings, "generation_workers", 3)
+    monkeypatch.setattr(OpenAPIPipeline, "run", fake_run)
+    monkeypatch.setattr(OpenAPIPipeline, "aclose", fake_aclose)
+
+    asyncio.run(main_module.main())
+    assert seen == [3]
+
+
+def test_pipeline_pool_survives_vanished_metainfo(tmp_path, monkeypatch):
+    """Если metainfo исчез после листинга каталога, ошибка записывается для одного рынка, а не роняет запуск"""
+    from tv_generator import main as main_module
+
+    data_dir = tmp_path / "data"
+    (data_dir / "metainfo").mkdir(parents=True)
+    (data_dir / "markets.json").write_text(json.dumps(["russia", "america"]), encoding="utf-8")
+    source = Path(__file__).parent.parent / "data" / "metainfo" / "russia.json"
+    for market in ("russia", "america"):
+        shutil.copy(source, data_dir / "metainfo" / f"{market}.json")
+
+    entry_size = main_module._entry_size
+
+    def vanish_america(entry):
+        if entry.name == "america.json":
+            os.unlink(entry.path)
+        return entry_size(entry)
+
+    monkeypatch.setattr(main_module, "_entry_size", vanish_america)
+    pipeline = OpenAPIPipeline(data_dir=data_dir, specs_dir=tmp_path / "specs", setup_logging=False)
+    result = asyncio.run(pipeline.run(workers=2))
+
+    assert [error.split(":")[0] for error in result.errors] == ["america"]
+    assert (tmp_path / "specs" / "russia_openapi.json").exists()
+
+
+def test_load_metainfo_returns_private_copy(tmp_path):
+    """Изменение результата _load_metainfo не должно портить кэшированный разбор файла"""
+    data_dir = tmp_path / "data"
+    (data_dir / "metainfo").mkdir(parents=True)
+    (data_dir / "metainfo" / "crypto.json").write_text(
+        json.dumps({"fields": [{"n": "close", "t": "price"}], "filters": {}}), encoding="utf-8"
+    )
+    pipeline = OpenAPIPipeline(data_dir=data_dir, specs_dir=tmp_path / "specs", setup_logging=False)
+
+    first = pipeline._load_metainfo("crypto")
+    first["fields"].append({"n": "injected", "t": "text"})
+    first["filters"] = None
+    first["extra"] = True
+
+    assert pipeline._load_metainfo("crypto") == {"fields": [{"n": "close", "t": "price"}], "filters": {}}
+